@@ -0,0 +1,188 @@
+"""Compound evaluation benchmarks.
+
+Run from the repository root with ``python -m benchmarks.bench_compound``.
+"""
+import timeit
+from typing import Sequence
+
+import mikan
+from mikan.base import BaseWord
+from mikan.combine import DefaultCombine
+
+def sentence() -> BaseWord:
+    eat = mikan.IchidanVerb('食べる', 'たべる')
+    did_not_want_to_eat = eat.conjugate(mikan.Form.TAI, mikan.Form.PAST, negative=True)
+    three_small_animals = mikan.Number(3) + mikan.Counter('匹', 'ひき')
+    cat = mikan.Word('猫', 'ねこ')
+    return cat + 'が' + three_small_animals + did_not_want_to_eat + 'です'
+
+def deep_sentence(depth: int=8) -> BaseWord:
+    words = sentence()
+    for _ in range(depth):
+        words = words + mikan.Word('日本', 'にほん', 'にっぽん') + sentence()
+    return words
+
+def bench_access(number: int=2000) -> None:
+    """Repeated accesses to an already built sentence."""
+
+    for name, words in (('README sentence', sentence()), ('deep sentence', deep_sentence())):
+        def access() -> None:
+            words.readings # pylint: disable=pointless-statement
+            str(words)
+            words == words # pylint: disable=pointless-statement,comparison-with-itself
+
+        elapsed = timeit.timeit(access, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e6:8.1f} us/access')
+
+def bench_build(number: int=200) -> None:
+    """Building and evaluating sentences from scratch."""
+
+    for name, func in (('README sentence', sentence), ('deep sentence', deep_sentence)):
+        elapsed = timeit.timeit(lambda: func().readings, number=number) # pylint: disable=cell-var-from-loop
+        print(f'{name:>20}: {elapsed / number * 1e3:8.2f} ms/sentence')
+
+def bench_add(number: int=20000) -> None:
+    """Cost of + between two words, with and without a special compound kind."""
+
+    cat = mikan.Word('猫', 'ねこ')
+    three = mikan.Number(3)
+    hiki = mikan.Counter('匹', 'ひき')
+    for name, func in (('word + word', lambda: cat + cat), ('number + counter', lambda: three + hiki)):
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e6:8.2f} us/add')
+
+def bench_chain(sizes: Sequence[int]=(100, 1_000, 10_000)) -> None:
+    """A long chain of +, which should grow linearly."""
+
+    cat = mikan.Word('猫', 'ねこ')
+
+    def chain(size: int) -> BaseWord:
+        words = cat
+        for _ in range(size):
+            words = words + cat + 'が'
+        return words
+
+    for size in sizes:
+        elapsed = timeit.timeit(lambda: chain(size).readings, number=1) # pylint: disable=cell-var-from-loop
+        print(f'{size:>12} words: {elapsed * 1e3:10.2f} ms')
+
+def bench_lattice(size: int=20, number: int=2000) -> None:
+    """A sentence with many writings, through its lattice and through its writings."""
+
+    word = mikan.Word('日本', 'にほん', 'にっぽん')
+    words = word
+    for _ in range(size - 1):
+        words = words + word
+
+    runs = (
+        ('count', lambda: words.lattice.count()),
+        ('first', lambda: words.lattice.first()),
+        ('sample', lambda: words.lattice.sample()),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e6:8.2f} us/call')
+    elapsed = timeit.timeit(lambda: words.writings, number=1)
+    print(f'{"writings":>20}: {elapsed * 1e3:8.2f} ms for {words.lattice.count()} writings')
+
+def bench_accepts(number: int=200) -> None:
+    """Checking an answer against a freshly built sentence's readings."""
+
+    answer = deep_sentence().readings[-1]
+    runs = (
+        ('accepts', lambda: deep_sentence().accepts(answer)),
+        ('in readings', lambda: answer in deep_sentence().readings),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e6:8.2f} us/check')
+
+def bench_sides(number: int=20) -> None:
+    """Evaluating only the readings or only the kanji writings of a new sentence."""
+
+    runs = (
+        ('writings', lambda: deep_sentence().writings),
+        ('readings', lambda: deep_sentence().readings),
+        ('kanji_writings', lambda: deep_sentence().kanji_writings),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e3:8.2f} ms/sentence')
+
+def bench_combine_cache(number: int=200) -> None:
+    """Building the same sentences again, without and with the combine cache."""
+
+    for name in ('no cache', 'combine cache'):
+        if name == 'combine cache':
+            mikan.enable_combine_cache()
+        try:
+            elapsed = timeit.timeit(lambda: deep_sentence().readings, number=number)
+        finally:
+            mikan.disable_combine_cache()
+        print(f'{name:>20}: {elapsed / number * 1e3:8.2f} ms/sentence')
+
+def bench_counters(number: int=20) -> None:
+    """Readings of counters after the numbers 1 to 100."""
+
+    numbers = [mikan.Number(value) for value in range(1, 101)]
+    counters = [mikan.Counter('本', 'ほん'), mikan.Counter('分', 'ふん'), mikan.Counter('枚', 'まい')]
+
+    def readings() -> None:
+        for num in numbers:
+            for counter in counters:
+                (num + counter).readings # pylint: disable=expression-not-assigned
+
+    elapsed = timeit.timeit(readings, number=number)
+    calls = number * len(numbers) * len(counters)
+    print(f'{"counter readings":>20}: {elapsed / calls * 1e6:8.2f} us/counter')
+
+def bench_budget(size: int=12, limit: int=100, number: int=20) -> None:
+    """Writings of a sentence with many of them, without and with a budget."""
+
+    word = mikan.Word('日本', 'にほん', 'にっぽん')
+    for name, combine in (('no budget', DefaultCombine()), (f'limit={limit}', DefaultCombine(limit))):
+        def writings() -> None:
+            mikan.Compound([word] * size, combine=combine).writings # pylint: disable=cell-var-from-loop,expression-not-assigned
+
+        elapsed = timeit.timeit(writings, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e3:8.2f} ms/sentence')
+
+def bench_best_readings(size: int=1000, number: int=20) -> None:
+    """The preferred readings of a long sentence."""
+
+    word = mikan.Word('日本', 'にほん', 'にっぽん')
+    words = word
+    for _ in range(size - 1):
+        words = words + word
+    for k in (1, 10):
+        elapsed = timeit.timeit(lambda: words.best_readings(k), number=number) # pylint: disable=cell-var-from-loop
+        print(f'{f"k={k}":>20}: {elapsed / number * 1e3:8.2f} ms for {size} words')
+
+def bench_numbers(number: int=2000) -> None:
+    """Numbers rendered from their digits, and built as compounds."""
+
+    values = [7, 1234, 30_000_000, 123_456_789_012_345_678]
+    runs = (
+        ('Number', lambda: [mikan.Number(value).writings for value in values]),
+        ('Number.compound', lambda: [mikan.Number(value).compound.writings for value in values]),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number / len(values) * 1e6:8.2f} us/number')
+
+def main() -> None:
+    bench_access()
+    bench_build()
+    bench_add()
+    bench_chain()
+    bench_lattice()
+    bench_accepts()
+    bench_sides()
+    bench_combine_cache()
+    bench_counters()
+    bench_budget()
+    bench_best_readings()
+    bench_numbers()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Memory held by a large vocabulary.
+
+Run from the repository root with ``python -m benchmarks.bench_memory``.
+"""
+import tracemalloc
+from typing import List
+
+import mikan
+
+VERBS = [('食べる', 'たべる'), ('見る', 'みる'), ('起きる', 'おきる'), ('寝る', 'ねる')]
+
+FORMS = [mikan.Form.PRESENT, mikan.Form.PAST, mikan.Form.TE, mikan.Form.VOLITIONAL]
+
+def load(size: int) -> List[mikan.Word]:
+    verbs = [mikan.IchidanVerb(*writings) for writings in VERBS]
+    words = []
+    for index in range(size):
+        verb = verbs[index % len(verbs)]
+        form = FORMS[(index // len(verbs)) % len(FORMS)]
+        words.append(verb.conjugate(form, polite=bool(index % 2) and form != mikan.Form.TE))
+    return words
+
+def bench_load(size: int=100_000) -> None:
+    """Traced memory per word, with and without interning."""
+
+    for interning in (False, True):
+        if interning:
+            mikan.enable_interning()
+        tracemalloc.start()
+        words = load(size)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mikan.disable_interning()
+        name = 'interning' if interning else 'no interning'
+        print(f'{name:>20}: {current / len(words):8.1f} bytes/word')
+
+def main() -> None:
+    bench_load()
+
+if __name__ == '__main__':
+    main()
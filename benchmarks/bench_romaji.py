@@ -0,0 +1,89 @@
+"""Romaji/kana conversion benchmarks.
+
+Run from the repository root with ``python -m benchmarks.bench_romaji``.
+"""
+import timeit
+from typing import Sequence
+
+import mikan
+from mikan.utils import Converter
+
+WORDS = ['きんようび', 'コンピューター', 'ちょっと', 'べんきょう', 'ミュージック']
+
+def bench_per_call(number: int=1000) -> None:
+    """Per-call cost of a fresh converter against the shared one."""
+
+    def fresh() -> None:
+        for word in WORDS:
+            Converter().to_romaji(word)
+
+    def shared() -> None:
+        for word in WORDS:
+            mikan.to_romaji(word)
+
+    calls = number * len(WORDS)
+    for name, func in (('fresh Converter', fresh), ('shared Converter', shared)):
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / calls * 1e6:8.2f} us/call')
+
+def bench_scaling(sizes: Sequence[int]=(1_000, 100_000, 10_000_000)) -> None:
+    """Conversion time against input size, which should grow linearly."""
+
+    sentence = 'ねこがさんびきたべたくなかったです。'
+    for size in sizes:
+        text = (sentence * (size // len(sentence) + 1))[:size]
+        number = max(1, 1_000_000 // size)
+        elapsed = timeit.timeit(
+            lambda: mikan.to_romaji(text, errors='ignore'), number=number
+        ) / number
+        print(f'{size:>12} chars: {elapsed * 1e3:10.2f} ms ({elapsed / size * 1e9:6.1f} ns/char)')
+
+def bench_batch(size: int=200_000, workers: int=4) -> None:
+    """A deck of repeated readings, one by one against the batch API."""
+
+    deck = [WORDS[i % len(WORDS)] + 'です' * (i % 7) for i in range(size)]
+    runs = (
+        ('to_romaji loop', lambda: [mikan.to_romaji(word) for word in deck]),
+        ('to_romaji_batch', lambda: list(mikan.to_romaji_batch(deck))),
+        (f'workers={workers}', lambda: list(mikan.to_romaji_batch(deck, workers=workers))),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=1)
+        print(f'{name:>20}: {elapsed * 1e3:8.1f} ms for {size} readings')
+
+def bench_kana(number: int=100_000) -> None:
+    """Hiragana to katakana through the symbol table and through str.translate."""
+
+    word = 'ちょっとまってください'
+    converter = Converter()
+    runs = (
+        ('symbol table', lambda: converter._convert(word, 2)), # pylint: disable=protected-access
+        ('hiragana_to_katakana', lambda: mikan.hiragana_to_katakana(word)),
+        ('str.translate', lambda: word.translate({})),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e6:8.2f} us/call')
+
+def bench_mixed(repeat: int=200, number: int=20) -> None:
+    """A paragraph mixing kanji, kana, latin and digits."""
+
+    paragraph = '昨日、友達と3時にカフェでcoffeeを飲みました。とても美味しかったです。' * repeat
+    runs = (
+        ('errors=ignore', lambda: mikan.to_romaji(paragraph, errors='ignore')),
+        ('errors=passthrough', lambda: mikan.to_romaji(paragraph, errors='passthrough')),
+        ('segment', lambda: mikan.segment(paragraph)),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number) / number
+        print(f'{name:>20}: {elapsed * 1e3:8.2f} ms for {len(paragraph)} chars')
+
+def main() -> None:
+    bench_per_call()
+    bench_scaling()
+    bench_batch()
+    bench_kana()
+    bench_mixed()
+
+if __name__ == '__main__':
+    main()
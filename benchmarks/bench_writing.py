@@ -0,0 +1,40 @@
+"""Writing creation and concatenation benchmarks.
+
+Run from the repository root with ``python -m benchmarks.bench_writing``.
+"""
+import timeit
+
+from mikan import Writing
+
+def bench_create(number: int=200_000) -> None:
+    """Writing.create and Writing.__add__ on kana and non-kana strings."""
+
+    kana = Writing.create('たべる')
+    kanji = Writing.create('食べる')
+    runs = (
+        ('create kana', lambda: Writing.create('たべる')),
+        ('create non-kana', lambda: Writing.create('食べる')),
+        ('add kana', lambda: kana + 'ます'),
+        ('add non-kana', lambda: kanji + 'ます'),
+    )
+    for name, func in runs:
+        elapsed = timeit.timeit(func, number=number)
+        print(f'{name:>20}: {elapsed / number * 1e9:8.1f} ns/call')
+
+def bench_build(pieces: int=5000) -> None:
+    """A long reading built piece by piece."""
+
+    def build() -> None:
+        sentence = Writing.create('')
+        for _ in range(pieces):
+            sentence += Writing.create('ねこ')
+
+    elapsed = timeit.timeit(build, number=1)
+    print(f'{"build reading":>20}: {elapsed * 1e3:8.1f} ms for {pieces} pieces')
+
+def main() -> None:
+    bench_create()
+    bench_build()
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
 from .adjective import *
 from .base import Form
+from .combine import *
 from .compound import *
 from .counter import *
 from .date import *
 from .exceptions import *
+from .lattice import *
 from .number import *
 from .reading import *
 from .utils import *
@@ -1,8 +1,10 @@
 from enum import Enum
 import abc
-from typing import List, Union, cast
+import itertools
+from typing import FrozenSet, Iterator, List, Optional, Set, Tuple, Union, cast
 
 from mikan.reading import Reading
+from mikan.utils import is_kana
 from mikan.writing import Writing
 
 Form = Enum('Form', (
@@ -23,20 +25,87 @@ Form = Enum('Form', (
 
 class BaseWord(abc.ABC):
 
+    # words are never modified once built, so the set of writings used for
+    # equality and hashing is computed on first use only
+    _writings_key: Optional[FrozenSet[Writing]] = None
+    # same for the writings split into non-kana writings and readings
+    _partition: Optional[Tuple[Tuple[Writing, ...], Tuple[Reading, ...]]] = None
+
+    def _key(self) -> FrozenSet[Writing]:
+        if self._writings_key is None:
+            self._writings_key = frozenset(self.writings)
+        return self._writings_key
+
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, BaseWord):
             return False
         word: BaseWord = other
-        return set(self.writings) == set(word.writings)
+        key, other_key = self._key(), word._key()
+        return hash(key) == hash(other_key) and key == other_key
+
+    def __hash__(self) -> int:
+        return hash(self._key())
 
     @property
     @abc.abstractmethod
     def writings(self) -> List[Writing]:
         pass
 
+    def _part(self, readings: bool) -> Tuple[Writing, ...]:
+        # either the readings of the word, or its other writings
+        if self._partition is None:
+            kanji: List[Writing] = []
+            kana: List[Reading] = []
+            for wri in self.writings:
+                if isinstance(wri, Reading):
+                    kana.append(wri)
+                else:
+                    kanji.append(wri)
+            self._partition = (tuple(kanji), tuple(kana))
+        return self._partition[readings]
+
     @property
     def readings(self) -> List[Reading]:
-        return cast(List[Reading], list(filter(lambda x: isinstance(x, Reading), self.writings)))
+        return cast(List[Reading], list(self._part(True)))
+
+    @property
+    def kanji_writings(self) -> List[Writing]:
+        return list(self._part(False))
+
+    def weight(self, writing: str) -> float: # pylint: disable=unused-argument
+        # how much a writing is preferred, the first listed one winning ties
+        return 0
+
+    def _best_readings(self) -> Iterator[Tuple[float, Reading]]:
+        # the readings with their costs, best first
+        return iter(sorted(
+            ((-self.weight(reading), reading) for reading in self.readings),
+            key=lambda item: item[0]
+        ))
+
+    def best_readings(self, k: int=1) -> List[Reading]:
+        return [reading for _, reading in itertools.islice(self._best_readings(), k)]
+
+    @property
+    def truncated(self) -> bool:
+        # whether some writings were left out to stay within a budget
+        return False
+
+    def _ends(self, string: str, start: int, readings: bool) -> Set[int]:
+        # where the word can end in string when it starts at start, either as
+        # one of its readings or as one of the writings it shows (the non-kana
+        # ones, or its readings if there are none)
+        candidates = self._part(readings) or self._part(True)
+        return {start + len(wri) for wri in candidates if string.startswith(wri, start)}
+
+    def accepts(self, reading: str) -> bool:
+        return len(reading) in self._ends(reading, 0, True)
+
+    def matches(self, writing: str) -> bool:
+        # kana writings are always readings too
+        return len(writing) in self._ends(writing, 0, is_kana(writing))
 
     @abc.abstractmethod
     def __add__(self, other: Union[str, 'BaseWord']) -> 'BaseWord':
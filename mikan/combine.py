@@ -1,9 +1,126 @@
+from collections import OrderedDict
+from enum import Enum
 import abc
-from typing import Callable, Dict, Iterable, List, Optional, SupportsInt
+import functools
+import itertools
+import threading
+from typing import (
+    Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, SupportsInt,
+    Tuple, TypeVar
+)
 
 from mikan.base import BaseWord
+from mikan.lattice import Lattice
 from mikan.reading import Reading
-from mikan.writing import Writing
+from mikan.writing import Writing, _new_writing
+
+__all__ = [
+    'CombineCacheInfo',
+    'VariantPolicy',
+    'Variants',
+    'combine_cache_info',
+    'disable_combine_cache',
+    'enable_combine_cache',
+]
+
+# which writings a combiner keeps when it can't keep them all: the ones listed
+# first, or the readings first
+VariantPolicy = Enum('VariantPolicy', (
+    'FIRST',
+    'KANA_FIRST',
+))
+
+class Variants(List[Writing]):
+
+    """Writings, some of which may have been left out."""
+
+    def __init__(self, writings: Iterable[Writing]=(), truncated: bool=False) -> None:
+        super().__init__(writings)
+        self.truncated = truncated
+
+class CombineCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+# when enabled, combinations of the same operand writings by the same kind of
+# combiner are shared by all compounds, least recently used ones evicted first
+_CACHE: Optional['OrderedDict[Hashable, Any]'] = None
+_CACHE_MAXSIZE = 0
+_CACHE_HITS = 0
+_CACHE_MISSES = 0
+_CACHE_LOCK = threading.Lock()
+
+def enable_combine_cache(maxsize: int=1 << 16) -> None:
+    global _CACHE, _CACHE_MAXSIZE, _CACHE_HITS, _CACHE_MISSES # pylint: disable=global-statement
+    with _CACHE_LOCK:
+        _CACHE = OrderedDict()
+        _CACHE_MAXSIZE = maxsize
+        _CACHE_HITS = _CACHE_MISSES = 0
+
+def disable_combine_cache() -> None:
+    global _CACHE # pylint: disable=global-statement
+    with _CACHE_LOCK:
+        _CACHE = None
+
+def combine_cache_info() -> CombineCacheInfo:
+    with _CACHE_LOCK:
+        return CombineCacheInfo(
+            _CACHE_HITS,
+            _CACHE_MISSES,
+            _CACHE_MAXSIZE,
+            len(_CACHE) if _CACHE is not None else 0
+        )
+
+_Method = TypeVar('_Method', bound=Callable[..., Any])
+
+def _cached(readings_only: bool) -> Callable[[_Method], _Method]:
+    # results depend on the combiner settings and on the operand writings: on
+    # their readings only for readings_only methods (the readings of a number
+    # also tell its value)
+
+    def decorator(method: _Method) -> _Method:
+
+        @functools.wraps(method)
+        def wrapper(self: 'BaseCombine', words: Iterable[BaseWord]) -> Any:
+            global _CACHE_HITS, _CACHE_MISSES # pylint: disable=global-statement
+            settings = self._cache_key() # pylint: disable=protected-access
+            if _CACHE is None or settings is None:
+                return method(self, words)
+
+            words = list(words)
+            if readings_only:
+                operands: Tuple[Any, ...] = tuple(word._part(True) for word in words) # pylint: disable=protected-access
+            else:
+                operands = tuple((word._part(False), word._part(True)) for word in words) # pylint: disable=protected-access
+            key = (type(self), settings, method.__name__, operands)
+
+            with _CACHE_LOCK:
+                cache = _CACHE
+                if cache is not None and key in cache:
+                    cache.move_to_end(key)
+                    _CACHE_HITS += 1
+                    result = cache[key]
+                    if isinstance(result, Variants):
+                        return Variants(result, result.truncated)
+                    return result
+                _CACHE_MISSES += 1
+
+            result = method(self, words)
+            with _CACHE_LOCK:
+                if cache is _CACHE and cache is not None:
+                    cache[key] = (
+                        Variants(result, getattr(result, 'truncated', False))
+                        if isinstance(result, list) else result
+                    )
+                    while len(cache) > _CACHE_MAXSIZE:
+                        cache.popitem(last=False)
+            return result
+
+        return wrapper # type: ignore
+
+    return decorator
 
 class BaseCombine(abc.ABC):
 
@@ -11,50 +128,115 @@ class BaseCombine(abc.ABC):
     def __call__(self, words: Iterable[BaseWord]) -> List[Writing]:
         pass
 
+    def lattice(self, words: Iterable[BaseWord]) -> Lattice:
+        return Lattice([self(words)])
+
+    def variants(self, lattice: Lattice) -> List[Writing]:
+        # the writings of a lattice this combiner built, as it would list them;
+        # a lattice made of single choices lists them as they are
+        branches = lattice.branches
+        if all(len(branch) == 1 for branch in branches):
+            return [wri for branch in branches for wri in branch[0]]
+        return list(lattice)
+
+    def readings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        return [wri for wri in self(words) if isinstance(wri, Reading)]
+
+    def kanji_writings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        return [wri for wri in self(words) if not isinstance(wri, Reading)]
+
+    def truncates(self, words: Iterable[BaseWord]) -> bool: # pylint: disable=unused-argument
+        # whether some writings of the words are left out
+        return False
+
+    def _cache_key(self) -> Optional[Hashable]:
+        # the settings of the combiner, or None if its results can't be cached
+        return None
+
+# combiners work on the writings of words already split between readings
+# and other writings, see BaseWord._part
+# pylint: disable=protected-access
+
 def _combine_writings(
-    writings1: List[Writing],
-    writings2: List[Writing],
-    testfunc: Optional[Callable[[Writing, Writing], bool]]=None
+    writings1: Sequence[Writing],
+    writings2: Sequence[Writing]
 ) -> List[Writing]:
 
-    writings = []
-    for writing1 in writings1:
-        for writing2 in writings2:
-            if testfunc is None or testfunc(writing1, writing2):
-                writings.append(writing1 + writing2)
-    return writings
+    return [writing1 + writing2 for writing1 in writings1 for writing2 in writings2]
+
+def _exceptions_key(exceptions: Dict[int, List[str]]) -> Hashable:
+    return tuple((value, tuple(readings)) for value, readings in sorted(exceptions.items()))
+
+def _number_value(number: BaseWord) -> int:
+    if not isinstance(number, SupportsInt):
+        raise ValueError
+    return int(number)
 
 class DefaultCombine(BaseCombine):
 
-    def __call__(self, words: Iterable[BaseWord]) -> List[Writing]:
-        readings = [Writing.create('')]
-        writings = [Writing.create('')]
+    # at most limit writings, readings and kanji writings are built, from
+    # the start of the lattice; each of them has its own budget, so readings
+    # may hold some left out of the writings; setting them on the class
+    # changes the default
+    limit: Optional[int] = None
+    policy = VariantPolicy.FIRST
+
+    def __init__(self, limit: Optional[int]=None, policy: Optional[VariantPolicy]=None) -> None:
+        if limit is not None:
+            self.limit = limit
+        if policy is not None:
+            self.policy = policy
+
+    def variants(self, lattice: Lattice) -> List[Writing]:
+        if self.limit is None or lattice.count() <= self.limit:
+            return Variants(lattice)
+        # the lattice is iterated lazily, so only what is kept is built
+        return Variants(itertools.islice(lattice, self.limit), truncated=True)
+
+    def truncates(self, words: Iterable[BaseWord]) -> bool:
+        return self.limit is not None and self.lattice(words).count() > self.limit
+
+    @staticmethod
+    def _writing_segments(words: Iterable[BaseWord]) -> Tuple[List[Sequence[Writing]], bool]:
+        # the non-kana writings of each word, or its readings if it has none
+        segments: List[Sequence[Writing]] = []
+        kanji = False
         for word in words:
-            wreadings: List[Writing] = []
-            wwritings: List[Writing] = []
-            for wri in word.writings:
-                if isinstance(wri, Reading):
-                    wreadings.append(wri)
-                else:
-                    wwritings.append(wri)
-            if len(readings) > 0 and len(wreadings) > 0:
-                new_readings = _combine_writings(readings, wreadings)
-            else:
-                new_readings = []
-
-            if len(writings) > 0 and len(wwritings) > 0:
-                new_writings = _combine_writings(writings, wwritings)
-            elif len(writings) > 0 and len(wreadings) > 0:
-                new_writings = _combine_writings(writings, wreadings)
-            elif len(readings) > 0 and len(wwritings) > 0:
-                new_writings = _combine_writings(readings, wwritings)
+            part = word._part(False)
+            if part:
+                kanji = True
             else:
-                new_writings = _combine_writings(readings + writings, wreadings + wwritings)
+                part = word._part(True)
+            segments.append(part)
+        return segments, kanji
 
-            readings = new_readings
-            writings = new_writings
+    def _cache_key(self) -> Optional[Hashable]:
+        return (self.limit, self.policy)
 
-        return writings + readings
+    @_cached(False)
+    def __call__(self, words: Iterable[BaseWord]) -> List[Writing]:
+        return self.variants(self.lattice(words))
+
+    @_cached(False)
+    def lattice(self, words: Iterable[BaseWord]) -> Lattice:
+        # without non-kana writings, the writings are the readings
+        words = list(words)
+        rsegments = [word._part(True) for word in words]
+        wsegments, kanji = self._writing_segments(words)
+        if not kanji:
+            return Lattice(rsegments)
+        if self.policy == VariantPolicy.KANA_FIRST:
+            return Lattice(rsegments, wsegments)
+        return Lattice(wsegments, rsegments)
+
+    @_cached(True)
+    def readings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        return self.variants(Lattice([word._part(True) for word in words]))
+
+    @_cached(False)
+    def kanji_writings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        wsegments, kanji = self._writing_segments(words)
+        return self.variants(Lattice(wsegments)) if kanji else Variants()
 
 class NumberCombine(BaseCombine):
 
@@ -65,126 +247,171 @@ class NumberCombine(BaseCombine):
     ) -> None:
         self._exceptions = exceptions or {}
         self._hide_one = hide_one
+        self._settings = (_exceptions_key(self._exceptions), hide_one)
+
+    def _cache_key(self) -> Optional[Hashable]:
+        return self._settings
 
     def __call__(self, words: Iterable[BaseWord]) -> List[Writing]:
+        words = list(words)
+        return self.kanji_writings(words) + self.readings(words)
+
+    @_cached(True)
+    def readings(self, words: Iterable[BaseWord]) -> List[Writing]:
         number, word = words
-        if not isinstance(number, SupportsInt):
-            raise ValueError
-        value = int(number)
+        value = _number_value(number)
 
         if self._hide_one and value == 1:
-            return word.writings
-
-        writings = _combine_writings(
-            number.writings,
-            word.writings,
-            lambda x, y: not isinstance(x, Reading) and not isinstance(y, Reading)
-        )
+            return list(word._part(True))
         if value in self._exceptions:
-            writings.extend([Reading(reading) for reading in self._exceptions[value]])
-        else:
-            writings.extend(_combine_writings(
-                number.writings,
-                word.writings,
-                lambda x, y: isinstance(x, Reading) and isinstance(y, Reading)
-            ))
+            return [Reading(reading) for reading in self._exceptions[value]]
+        return _combine_writings(number._part(True), word._part(True))
 
-        return writings
+    @_cached(False)
+    def kanji_writings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        number, word = words
+        value = _number_value(number)
+
+        if self._hide_one and value == 1:
+            return list(word._part(False))
+        return _combine_writings(number._part(False), word._part(False))
 
 class TsuCombine(BaseCombine):
 
     def __init__(self, exceptions: Optional[Dict[int, List[str]]]=None) -> None:
         self._exceptions = exceptions or {}
+        self._settings = _exceptions_key(self._exceptions)
+
+    def _cache_key(self) -> Optional[Hashable]:
+        return self._settings
 
     def __call__(self, words: Iterable[BaseWord]) -> List[Writing]:
+        words = list(words)
+        return self.kanji_writings(words) + self.readings(words)
+
+    @_cached(True)
+    def readings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        number, _ = words
+        return [Reading(reading) for reading in self._exceptions.get(_number_value(number), [])]
+
+    @_cached(False)
+    def kanji_writings(self, words: Iterable[BaseWord]) -> List[Writing]:
         number, word = words
-        if not isinstance(number, SupportsInt):
-            raise ValueError
-
-        writings = []
-        for wri1 in number.writings:
-            for wri2 in word.writings:
-                if not isinstance(wri1, Reading):
-                    writings.append(wri1 + wri2)
-        value = int(number)
-        if value in self._exceptions:
-            writings.extend([Reading(reading) for reading in self._exceptions[value]])
-
-        return writings
-
-def _build_h_exceptions(
-    dakuten: str,
-    handakuten: str
-) -> Dict[str, Callable[[str, str], List[str]]]:
-
-    return {
-        'いち': lambda x, y: [x[:-1] + 'っ' + handakuten + y[1:]],
-        'さん': lambda x, y: [x + dakuten + y[1:]],
-        'ろく': lambda x, y: [x[:-1] + 'っ' + handakuten + y[1:]],
-        'はち': lambda x, y: [x[:-1] + 'っ' + handakuten + y[1:], x + y],
-        'じゅう': lambda x, y: [x[:-1] + 'っ' + handakuten + y[1:]],
-    }
-
-def _build_k_exceptions(
-    kana: str,
-) -> Dict[str, Callable[[str, str], List[str]]]:
-
-    return {
-        'いち': lambda x, y: [x[:-1] + 'っ' + kana + y[1:]],
-        'ろく': lambda x, y: [x[:-1] + 'っ' + kana + y[1:]],
-        'はち': lambda x, y: [x[:-1] + 'っ' + kana + y[1:], x + y],
-        'じゅう': lambda x, y: [x[:-1] + 'っ' + kana + y[1:]],
-    }
-
-class StandardCombine(BaseCombine):
-
-    __EXCEPTIONS: Dict[str, Dict[str, Callable[[str, str], List[str]]]] = {
-        'ふ': {
-            'いち': lambda x, y: [x[:-1] + 'っぷ' + y[1:]],
-            'さん': lambda x, y: [x[:-1] + 'っぷ' + y[1:]],
-            'ろく': lambda x, y: [x[:-1] + 'っぷ' + y[1:]],
-            'はち': lambda x, y: [x[:-1] + 'っぷ' + y[1:]],
-            'じゅう': lambda x, y: [x[:-1] + 'っぷ' + y[1:]],
-        },
-        'ひ': _build_h_exceptions('び', 'ぴ'),
-        'ほ': _build_h_exceptions('ぼ', 'ぽ'),
-        'か': _build_k_exceptions('か'),
-        'け': _build_k_exceptions('け'),
-        'こ': _build_k_exceptions('こ'),
-        'さ': {
-            'いち': lambda x, y: [x[:-1] + 'っさ' + y[1:]],
-            'はち': lambda x, y: [x[:-1] + 'っさ' + y[1:], x + y],
-            'じゅう': lambda x, y: [x[:-1] + 'っさ' + y[1:]],
-        },
-    }
-
-    def _find_func(self, writing1: str, writing2: str) -> Optional[Callable[[str, str], List[str]]]:
-        if writing2[0] not in self.__EXCEPTIONS:
+        _number_value(number)
+        return _combine_writings(number._part(False), word._part(False) + word._part(True))
+
+class SoundChanges:
+
+    """Sound changes at the boundary between two readings."""
+
+    # rules are keyed by the tail of the first reading ('' matching any) and
+    # the first kana of the second one; each gives splices, made of how many
+    # kana to drop from the first reading and what replaces the first kana of
+    # the second one
+
+    def __init__(self, rules: Dict[Tuple[str, str], Sequence[Tuple[int, str]]]) -> None:
+        self._rules = {key: tuple(splices) for key, splices in rules.items()}
+        self._tails = {tail for tail, _ in self._rules}
+        self._lengths = sorted({len(tail) for tail in self._tails if tail}, reverse=True)
+
+    def tail(self, reading: str) -> str:
+        for length in self._lengths:
+            if reading[-length:] in self._tails:
+                return reading[-length:]
+        return ''
+
+    def splice(
+        self,
+        reading1: str,
+        reading2: str,
+        tail: Optional[str]=None
+    ) -> Optional[List[Writing]]:
+
+        # the readings of both readings together, or None if no rule applies
+        if tail is None:
+            tail = self.tail(reading1)
+        splices = self._rules.get((tail, reading2[:1]))
+        if splices is None:
             return None
+        # readings spliced together are still readings
+        return [
+            _new_writing(Reading, reading1[:len(reading1) - drop] + head + reading2[1:])
+            for drop, head in splices
+        ]
 
-        exceptions = self.__EXCEPTIONS[writing2[0]]
+def _counter_rules() -> Dict[Tuple[str, str], Sequence[Tuple[int, str]]]:
+    rules: Dict[Tuple[str, str], Sequence[Tuple[int, str]]] = {}
 
-        if writing1[-3:] in exceptions:
-            return exceptions[writing1[-3:]]
-        if writing1[-2:] in exceptions:
-            return exceptions[writing1[-2:]]
-        return None
+    for tail in ('いち', 'さん', 'ろく', 'はち', 'じゅう'):
+        rules[(tail, 'ふ')] = ((1, 'っぷ'),)
+
+    for head, dakuten, handakuten in (('ひ', 'び', 'ぴ'), ('ほ', 'ぼ', 'ぽ')):
+        rules[('いち', head)] = ((1, 'っ' + handakuten),)
+        rules[('さん', head)] = ((0, dakuten),)
+        rules[('ろく', head)] = ((1, 'っ' + handakuten),)
+        rules[('はち', head)] = ((1, 'っ' + handakuten), (0, head))
+        rules[('じゅう', head)] = ((1, 'っ' + handakuten),)
+
+    for head in ('か', 'け', 'こ'):
+        rules[('いち', head)] = ((1, 'っ' + head),)
+        rules[('ろく', head)] = ((1, 'っ' + head),)
+        rules[('はち', head)] = ((1, 'っ' + head), (0, head))
+        rules[('じゅう', head)] = ((1, 'っ' + head),)
+
+    rules[('いち', 'さ')] = ((1, 'っさ'),)
+    rules[('はち', 'さ')] = ((1, 'っさ'), (0, 'さ'))
+    rules[('じゅう', 'さ')] = ((1, 'っさ'),)
+
+    return rules
+
+COUNTER_SOUND_CHANGES = SoundChanges(_counter_rules())
+
+RENDAKU = SoundChanges({
+    ('', head): ((0, dakuten),)
+    for head, dakuten in zip(
+        'かきくけこさしすせそたちつてとはひふへほ',
+        'がぎぐげござじずぜぞだぢづでどばびぶべぼ'
+    )
+})
+
+class SoundChangeCombine(BaseCombine):
+
+    def __init__(self, changes: SoundChanges) -> None:
+        self._changes = changes
+
+    def _cache_key(self) -> Optional[Hashable]:
+        return self._changes
 
     def __call__(self, words: Iterable[BaseWord]) -> List[Writing]:
+        words = list(words)
+        return self.kanji_writings(words) + self.readings(words)
+
+    @_cached(True)
+    def readings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        word1, word2 = words
+
+        readings: List[Writing] = []
+        for wri1 in word1._part(True):
+            tail = self._changes.tail(wri1)
+            for wri2 in word2._part(True):
+                spliced = self._changes.splice(wri1, wri2, tail)
+                if spliced is not None:
+                    readings.extend(spliced)
+                else:
+                    readings.append(wri1 + wri2)
+        return readings
+
+    @_cached(False)
+    def kanji_writings(self, words: Iterable[BaseWord]) -> List[Writing]:
+        word1, word2 = words
+        return _combine_writings(word1._part(False), word2._part(False))
 
-        number, counter = words
+class StandardCombine(SoundChangeCombine):
 
-        writings: List[Writing] = []
+    def __init__(self) -> None:
+        super().__init__(COUNTER_SOUND_CHANGES)
 
-        for wri1 in number.writings:
-            for wri2 in counter.writings:
-                if isinstance(wri1, Reading) and isinstance(wri2, Reading):
-                    func = self._find_func(wri1, wri2)
-                    if func is not None:
-                        writings.extend([Reading(reading) for reading in func(wri1, wri2)])
-                    else:
-                        writings.append(wri1 + wri2)
-                elif (not isinstance(wri1, Reading)) and (not isinstance(wri2, Reading)):
-                    writings.append(wri1 + wri2)
+class RendakuCombine(SoundChangeCombine):
 
-        return writings
+    def __init__(self) -> None:
+        super().__init__(RENDAKU)
@@ -1,17 +1,64 @@
-from typing import Iterable, List, Type, Union, Sequence, Optional
+import heapq
+import threading
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Type, Union, Sequence, Optional, cast
 from mikan.base import BaseWord
 from mikan.combine import BaseCombine, DefaultCombine
+from mikan.lattice import Lattice
+from mikan.reading import Reading
 from mikan.writing import Writing
 import mikan.word
 
 __all__ = ['Compound']
 
-class Compound(BaseWord):
+_EXTEND_LOCK = threading.Lock()
+
+class _Readings:
+
+    """The readings of a word with their costs, pulled only once needed."""
+
+    def __init__(self, readings: Iterator[Tuple[float, Reading]]) -> None:
+        self._readings = readings
+        self._pulled: List[Tuple[float, Reading]] = []
+
+    def has(self, index: int) -> bool:
+        while len(self._pulled) <= index:
+            item = next(self._readings, None)
+            if item is None:
+                return False
+            self._pulled.append(item)
+        return True
+
+    def __getitem__(self, index: int) -> Tuple[float, Reading]:
+        return self._pulled[index]
+
+class Compound(BaseWord): # pylint: disable=too-many-instance-attributes
 
     subclasses: List[Type['Compound']] = []
 
+    # (left, right) word types a compound kind is made of
+    operands: Sequence[Tuple[type, type]] = ()
+
+    _kinds: Dict[Tuple[type, type], Type['Compound']] = {}
+    _dispatch: Dict[Tuple[type, type], Optional[Type['Compound']]] = {}
+
     def __init_subclass__(cls) -> None:
         cls.subclasses.append(cls)
+        for operands in cls.operands:
+            Compound._kinds[operands] = cls
+        Compound._dispatch.clear()
+
+    @staticmethod
+    def _find_kind(left: type, right: type) -> Optional[Type['Compound']]:
+        # the most specific operand types win, the left one first
+        key = (left, right)
+        if key not in Compound._dispatch:
+            Compound._dispatch[key] = next((
+                Compound._kinds[(lsuper, rsuper)]
+                for lsuper in left.__mro__
+                for rsuper in right.__mro__
+                if (lsuper, rsuper) in Compound._kinds
+            ), None)
+        return Compound._dispatch[key]
 
     @classmethod
     def create(
@@ -20,17 +67,17 @@ class Compound(BaseWord):
         writings: Optional[Sequence[Union[str, Writing]]]=None
     ) -> 'Compound':
 
-        compound = None
-        for sub in cls.subclasses:
-            try:
-                compound = sub(words, writings=writings)
-            except ValueError:
-                pass
+        # longer compounds are dispatched on their first two words, their kind
+        # raising ValueError when it can't be made of the others
+        if len(words) >= 2:
+            kind = Compound._find_kind(type(words[0]), type(words[1]))
+            if kind is not None:
+                try:
+                    return kind(words, writings=writings)
+                except ValueError:
+                    pass
 
-        if compound is None:
-            compound = Compound(words, writings=writings)
-
-        return compound
+        return Compound(words, writings=writings)
 
     def __init__(
         self,
@@ -42,18 +89,172 @@ class Compound(BaseWord):
         super().__init__()
 
         self._words = list(words)
-        self._writings = None
+        # the words list may be shared with longer compounds built by +, only
+        # its first _size words belong to this one
+        self._size = len(self._words)
+        self._writings: Optional[Tuple[Writing, ...]] = None
         if writings is not None:
-            self._writings = [Writing.create(writing) for writing in writings]
+            self._writings = tuple(Writing.create(writing) for writing in writings)
         self._combine = combine or DefaultCombine()
+        self._lattice: Optional[Lattice] = None
+        self._evaluated: Optional[Tuple[Writing, ...]] = None
+        # each side is evaluated on its own when only one of them is needed
+        self._parts: List[Optional[Tuple[Writing, ...]]] = [None, None]
+        self._truncated: Optional[bool] = None
+
+    @classmethod
+    def _shared(cls, words: List[BaseWord], size: int, combine: BaseCombine) -> 'Compound':
+        # a compound made of the first size words of a list shared with others
+        compound = cls((), combine=combine)
+        compound._words = words
+        compound._size = size
+        return compound
+
+    def _extend(self, word: BaseWord) -> 'Compound':
+        # the words list is appended to in place as long as this compound is
+        # the longest one sharing it, so a chain of + builds in linear time
+        with _EXTEND_LOCK:
+            words = self._words
+            if len(words) != self._size:
+                words = words[:self._size]
+            words.append(word)
+        return Compound._shared(words, self._size + 1, self._combine)
 
     def __add__(self, other: Union[str, BaseWord]) -> BaseWord:
         word = other if isinstance(other, BaseWord) else mikan.word.Word(other)
+        # plain compounds are flattened rather than nested, unless a special
+        # compound kind applies
+        if (
+            type(self) is Compound and # pylint: disable=unidiomatic-typecheck
+            type(self._combine) is DefaultCombine and # pylint: disable=unidiomatic-typecheck
+            self._writings is None and
+            Compound._find_kind(Compound, type(word)) is None
+        ):
+            return self._extend(word)
         return Compound.create((self, word))
 
+    def _own_words(self) -> List[BaseWord]:
+        if len(self._words) != self._size:
+            return self._words[:self._size]
+        return self._words
+
+    @property
+    def lattice(self) -> Lattice:
+        # compounds are never modified once built: combine the words once
+        if self._lattice is None:
+            if self._writings is not None:
+                self._lattice = Lattice([self._writings])
+            else:
+                self._lattice = self._combine.lattice(self._own_words())
+        return self._lattice
+
     @property
     def writings(self) -> List[Writing]:
-        if self._writings is not None:
-            return self._writings
+        if self._evaluated is None:
+            if self._writings is not None:
+                self._evaluated = self._writings
+            elif self._lattice is not None:
+                # already combined, e.g. by str()
+                self._evaluated = tuple(self._combine.variants(self._lattice))
+            else:
+                self._evaluated = tuple(self._combine(self._own_words()))
+        return list(self._evaluated)
+
+    def _truncates(self) -> bool:
+        # combiners with a budget tell whether they leave writings out, which
+        # doesn't need them to be built
+        if self._truncated is None:
+            self._truncated = (
+                self._writings is None and self._combine.truncates(self._own_words())
+            )
+        return self._truncated
+
+    @property
+    def truncated(self) -> bool:
+        return self._truncates() or any(word.truncated for word in self._own_words())
+
+    def _part(self, readings: bool) -> Tuple[Writing, ...]:
+        # truncated writings may have left out a whole side
+        if self._writings is not None or (self._evaluated is not None and not self._truncates()):
+            return super()._part(readings)
+
+        part = self._parts[readings]
+        if part is None:
+            if readings:
+                part = tuple(self._combine.readings(self._own_words()))
+            else:
+                part = tuple(self._combine.kanji_writings(self._own_words()))
+            self._parts[readings] = part
+        return part
+
+    def _ends(self, string: str, start: int, readings: bool) -> Set[int]:
+        # default combinations are matched word by word, keeping only the
+        # positions some prefix of the string can reach; other compounds have
+        # few writings, which already follow their exceptions
+        if (
+            self._writings is not None or
+            type(self._combine) is not DefaultCombine # pylint: disable=unidiomatic-typecheck
+        ):
+            return super()._ends(string, start, readings)
+
+        positions = {start}
+        for word in self._own_words():
+            positions = {
+                end
+                for position in positions
+                for end in word._ends(string, position, readings) # pylint: disable=protected-access
+            }
+            if not positions:
+                break
+        return positions
+
+    def _best_readings(self) -> Iterator[Tuple[float, Reading]]:
+        if (
+            self._writings is not None or
+            type(self._combine) is not DefaultCombine # pylint: disable=unidiomatic-typecheck
+        ):
+            return super()._best_readings()
+        return self._best_combined_readings()
+
+    def _best_combined_readings(self) -> Iterator[Tuple[float, Reading]]:
+        # the cost of a reading is the sum of the costs of the readings it is
+        # made of; choices of readings are visited best first, ties going to
+        # the first listed ones, and only expanded once the previous best
+        # reading has been used
+        segments = [
+            _Readings(word._best_readings()) # pylint: disable=protected-access
+            for word in self._own_words()
+        ]
+        if not all(segment.has(0) for segment in segments):
+            return
+
+        # a choice only keeps the words not using their best reading, as
+        # (-position, index) pairs by position, which compare like the full
+        # choices would
+        start: Tuple[Tuple[int, int], ...] = ()
+        heap = [(sum(segment[0][0] for segment in segments), start)]
+        seen = {start}
+        while heap:
+            cost, choice = heapq.heappop(heap)
+            indexes = {-position: index for position, index in choice}
+            yield cost, cast(Reading, Writing.create(''.join(
+                segment[indexes.get(position, 0)][1] for position, segment in enumerate(segments)
+            )))
+            for position, segment in enumerate(segments):
+                index = indexes.get(position, 0)
+                if not segment.has(index + 1):
+                    continue
+                successor = tuple(sorted(
+                    [pair for pair in choice if pair[0] != -position] + [(-position, index + 1)],
+                    reverse=True
+                ))
+                if successor not in seen:
+                    seen.add(successor)
+                    heapq.heappush(
+                        heap, (cost - segment[index][0] + segment[index + 1][0], successor)
+                    )
 
-        return self._combine(self._words)
+    def __str__(self) -> str:
+        if self._evaluated is not None:
+            return str(self._evaluated[0])
+        return str(self.lattice.first())
@@ -19,6 +19,8 @@ class Counter(Word):
 
 class CounterCompound(Compound):
 
+    operands = ((Number, Counter),)
+
     def __init__(self, words: List[Word], writings: Optional[List[Writing]]=None) -> None:
 
         if (
@@ -36,6 +38,8 @@ class DayHourCounter(Word):
 
 class DayHourCounterCompound(Compound):
 
+    operands = ((Number, DayHourCounter),)
+
     __EXCEPTIONS = {
         4: ['よじ'],
         9: ['くじ'],
@@ -62,6 +66,8 @@ class MonthDayCounter(Word):
 
 class MonthDayCounterCompound(Compound):
 
+    operands = ((Number, MonthDayCounter),)
+
     __EXCEPTIONS = {
         1: ['ついたち'],
         2: ['ふつか'],
@@ -99,6 +105,8 @@ class MonthCounter(Word):
 
 class MonthCounterCompound(Compound):
 
+    operands = ((Number, MonthCounter),)
+
     __EXCEPTIONS = {
         4: ['しがつ'],
         7: ['しちがつ'],
@@ -126,6 +134,8 @@ class PersonCounter(Word):
 
 class PersonCounterCompound(Compound):
 
+    operands = ((Number, PersonCounter),)
+
     __EXCEPTIONS = {
         1: ['ひとり'],
         2: ['ふたり'],
@@ -154,6 +164,8 @@ class TsuCounter(Word):
 
 class TsuCounterCompound(Compound):
 
+    operands = ((Number, TsuCounter),)
+
     __EXCEPTIONS = {
         1: ['ひとつ'],
         2: ['ふたつ'],
@@ -0,0 +1,65 @@
+import itertools
+import math
+import random
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from mikan.writing import Writing
+
+__all__ = ['Lattice']
+
+class Lattice:
+
+    """The writings of a compound, without enumerating them."""
+
+    # a lattice is a list of branches, each one a sequence of segments, and
+    # each segment a choice between writings; paths are ordered branch by
+    # branch, then as itertools.product orders them
+
+    def __init__(self, *branches: Iterable[Iterable[Writing]]) -> None:
+        self._branches: Tuple[Tuple[Tuple[Writing, ...], ...], ...] = tuple(
+            tuple(tuple(segment) for segment in branch) for branch in branches
+        )
+        self._sizes = tuple(
+            math.prod(len(segment) for segment in branch) for branch in self._branches
+        )
+
+    @property
+    def branches(self) -> List[List[List[Writing]]]:
+        return [[list(segment) for segment in branch] for branch in self._branches]
+
+    def count(self) -> int:
+        return sum(self._sizes)
+
+    def __iter__(self) -> Iterator[Writing]:
+        for branch in self._branches:
+            for parts in itertools.product(*branch):
+                yield Writing.create(''.join(parts))
+
+    def __getitem__(self, index: int) -> Writing:
+        count = self.count()
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('lattice index out of range')
+
+        for branch, size in zip(self._branches, self._sizes):
+            if index >= size:
+                index -= size
+                continue
+            parts = []
+            for segment in reversed(branch):
+                index, rest = divmod(index, len(segment))
+                parts.append(segment[rest])
+            return Writing.create(''.join(reversed(parts)))
+
+        raise IndexError('lattice index out of range')
+
+    def first(self) -> Writing:
+        return self[0]
+
+    def sample(self, rng: Optional[random.Random]=None) -> Writing:
+        # every path has the same chance to be picked
+        count = self.count()
+        if count == 0:
+            raise IndexError('sample from an empty lattice')
+        return self[(rng or random).randrange(count)]
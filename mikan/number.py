@@ -1,6 +1,8 @@
+import functools
+import itertools
 from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from mikan.base import BaseWord
-from mikan.combine import NumberCombine, StandardCombine
+from mikan.combine import COUNTER_SOUND_CHANGES, NumberCombine, StandardCombine
 from mikan.word import Word
 from mikan.writing import Writing
 from mikan.compound import Compound
@@ -38,6 +40,8 @@ class Juu(Word):
         super().__init__('十', 'じゅう')
 
 class JuuCompound(Compound):
+    operands = ((Digit, Juu),)
+
     def __init__(self, words: Tuple[Digit, Juu], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -52,6 +56,14 @@ class Hyaku(Word):
         super().__init__('百', 'ひゃく')
 
 class HyakuCompound(Compound):
+    operands = ((Digit, Hyaku),)
+
+    EXCEPTIONS: Dict[int, List[str]] = {
+        3: ['さんびゃく'],
+        6: ['ろっぴゃく'],
+        8: ['はっぴゃく'],
+    }
+
     def __init__(self, words: Tuple[Digit, Hyaku], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -59,19 +71,20 @@ class HyakuCompound(Compound):
         ):
             raise ValueError
 
-        exceptions = {
-            3: ['さんびゃく'],
-            6: ['ろっぴゃく'],
-            8: ['はっぴゃく'],
-        }
-
-        super().__init__(words, combine=NumberCombine(exceptions, hide_one=True))
+        super().__init__(words, combine=NumberCombine(self.EXCEPTIONS, hide_one=True))
 
 class Sen(Word):
     def __init__(self) -> None:
         super().__init__('千', 'せん')
 
 class SenCompound(Compound):
+    operands = ((Digit, Sen),)
+
+    EXCEPTIONS: Dict[int, List[str]] = {
+        3: ['さんぜん'],
+        8: ['はっせん'],
+    }
+
     def __init__(self, words: Tuple[Digit, Sen], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -79,14 +92,11 @@ class SenCompound(Compound):
         ):
             raise ValueError
 
-        exceptions = {
-            3: ['さんぜん'],
-            8: ['はっせん'],
-        }
-
-        super().__init__(words, combine=NumberCombine(exceptions, hide_one=True))
+        super().__init__(words, combine=NumberCombine(self.EXCEPTIONS, hide_one=True))
 
 class MyriadCompound(Compound):
+    operands = tuple(itertools.permutations((Digit, JuuCompound, HyakuCompound, SenCompound), 2))
+
     def __init__(self, words: Sequence[BaseWord], writings: Optional[List[Writing]]=None) -> None:
         if (len(words) == 0) or (len(words) > 4):
             raise ValueError
@@ -123,6 +133,8 @@ class Man(Word):
         super().__init__('万', 'まん')
 
 class ManCompound(Compound):
+    operands = ((MyriadCompound, Man),)
+
     def __init__(self, words: List[Word], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -137,6 +149,8 @@ class Oku(Word):
         super().__init__('億', 'おく')
 
 class OkuCompound(Compound):
+    operands = ((MyriadCompound, Oku),)
+
     def __init__(self, words: List[Word], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -151,6 +165,8 @@ class Chou(Word):
         super().__init__('兆', 'ちょう')
 
 class ChouCompound(Compound):
+    operands = ((MyriadCompound, Chou),)
+
     def __init__(self, words: List[Word], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -165,6 +181,8 @@ class Kei(Word):
         super().__init__('京', 'けい')
 
 class KeiCompound(Compound):
+    operands = ((MyriadCompound, Kei),)
+
     def __init__(self, words: List[Word], writings: Optional[List[Writing]]=None) -> None:
         if (
             (len(words) != 2) or
@@ -174,10 +192,69 @@ class KeiCompound(Compound):
 
         super().__init__(words, combine=StandardCombine())
 
+# the reading exceptions of each power of ten in a group of four digits
+_UNIT_EXCEPTIONS: List[Dict[int, List[str]]] = [
+    {}, {}, HyakuCompound.EXCEPTIONS, SenCompound.EXCEPTIONS
+]
+
+@functools.lru_cache(maxsize=10000)
+def _render_myriad(num: int) -> Tuple[str, str]:
+    # the kanji and the reading of a group of four digits, the same as the
+    # MyriadCompound of Number._from_myriad would give
+    kanji = []
+    reading = []
+    for position in range(3, -1, -1):
+        value = num // 10 ** position % 10
+        if value == 0:
+            continue
+        digit_kanji, digit_kana = Digit.DIGITS[value]
+        if position == 0:
+            kanji.append(digit_kanji)
+            reading.append(digit_kana)
+            continue
+        unit_kanji, unit_kana = (str(writing) for writing in Number.DIGITS[position - 1].writings)
+        kanji.append(unit_kanji if value == 1 else digit_kanji + unit_kanji)
+        if value == 1:
+            reading.append(unit_kana)
+        elif value in _UNIT_EXCEPTIONS[position]:
+            reading.append(_UNIT_EXCEPTIONS[position][value][0])
+        else:
+            reading.append(digit_kana + unit_kana)
+    return ''.join(kanji), ''.join(reading)
+
 class Number(Word):
     DIGITS = [Juu(), Hyaku(), Sen()]
     MYRIADS = [Man(), Oku(), Chou(), Kei()]
 
+    @staticmethod
+    def _render(num: int) -> List[str]:
+        # the kanji writing and readings of a number, straight from its digits;
+        # only kei changes the reading of its group, like a counter would
+        kanji = ''
+        readings = ['']
+        groups = list(Number._myriad_generator(num))
+        for index in range(len(groups) - 1, -1, -1):
+            if groups[index] == 0:
+                continue
+            group_kanji, group_kana = _render_myriad(groups[index])
+            parts = [group_kana]
+            if index > 0:
+                myriad_kanji, myriad_kana = (
+                    str(writing) for writing in Number.MYRIADS[index - 1].writings
+                )
+                group_kanji += myriad_kanji
+                parts = [group_kana + myriad_kana]
+                if isinstance(Number.MYRIADS[index - 1], Kei):
+                    spliced = COUNTER_SOUND_CHANGES.splice(group_kana, myriad_kana)
+                    if spliced:
+                        parts = [str(reading) for reading in spliced]
+            kanji += group_kanji
+            readings = [reading + part for reading in readings for part in parts]
+
+        if not kanji:
+            return readings
+        return [kanji] + readings
+
     @staticmethod
     def _myriad_generator(num: int) -> Iterator[int]:
         while num:
@@ -286,9 +363,19 @@ class Number(Word):
         if digits is None:
             raise ValueError('Not a number')
 
+        if digits < 0:
+            raise ValueError('Not a number')
+
         self._digits = digits
-        word = self._from_digits(digits)
-        super().__init__(word)
+        self._compound: Optional[Compound] = None
+        super().__init__(*self._render(digits))
+
+    @property
+    def compound(self) -> Compound:
+        # the words the number is made of, only built when asked for
+        if self._compound is None:
+            self._compound = self._from_digits(self._digits)
+        return self._compound
 
     def __int__(self) -> int:
         return self._digits
@@ -5,7 +5,21 @@ __all__ = ['Reading']
 
 class Reading(Writing):
 
+    __slots__ = ()
+
     def __new__(cls, string: str) -> 'Reading':
         if not is_kana(string):
             raise ValueError
         return super().__new__(cls, string)
+
+    @classmethod
+    def accepts(cls, string: str) -> bool:
+        return is_kana(string)
+
+    @classmethod
+    def accepts_concatenation(cls, prefix: str, suffix: str) -> bool:
+        # both parts must be kana, and readings already are
+        return (
+            (isinstance(prefix, Reading) or is_kana(prefix)) and
+            (isinstance(suffix, Reading) or is_kana(suffix))
+        )
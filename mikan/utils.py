@@ -1,33 +1,187 @@
-from typing import Optional, Tuple, Dict, List, Callable, Iterable
+# pylint: disable=too-many-lines
+from array import array
+import collections
+from enum import Enum
+import concurrent.futures
+import functools
+import importlib
+import itertools
+import re
+import threading
+from typing import (
+    Any, Deque, Optional, Pattern, Tuple, Dict, List, Callable, Iterable, Iterator, TextIO, Union,
+    cast
+)
 from mikan.exceptions import ConversionError
 
+try:
+    np: Any = importlib.import_module('numpy')
+except ImportError:
+    np = None # pylint: disable=invalid-name
+
 __all__ = [
+    'hiragana_to_katakana',
+    'IncrementalConverter',
+    'katakana_to_hiragana',
+    'register_scheme',
+    'Scheme',
+    'Script',
+    'segment',
     'to_hiragana',
+    'to_hiragana_aligned',
     'to_katakana',
+    'to_katakana_aligned',
+    'to_hiragana_batch',
+    'to_katakana_batch',
     'to_romaji',
+    'to_romaji_aligned',
+    'to_romaji_batch',
+    'to_romaji_stream',
+    'to_hiragana_stream',
+    'to_katakana_stream',
 ]
 
-def _is_one_hiragana(char: str) -> bool:
-    if (ord(char) < 0x3041) or (ord(char) > 0x309E):
-        return False
-    return True
+_HIRAGANA_RANGES = ((0x3041, 0x309E),)
+_KATAKANA_RANGES = ((0x30A0, 0x30FE),)
+_KANA_RANGES = _HIRAGANA_RANGES + _KATAKANA_RANGES
 
-def _is_one_katakana(char: str) -> bool:
-    if (ord(char) < 0x30A0) or (ord(char) > 0x30FE):
-        return False
-    return True
+def _build_classifier(ranges: Tuple[Tuple[int, int], ...]) -> Pattern[str]:
+    chars = ''.join(f'{chr(low)}-{chr(high)}' for low, high in ranges)
+    return re.compile(f'[{chars}]*')
 
-def _is_one_kana(char: str) -> bool:
-    return _is_one_hiragana(char) or _is_one_katakana(char)
+_HIRAGANA = _build_classifier(_HIRAGANA_RANGES)
+_KATAKANA = _build_classifier(_KATAKANA_RANGES)
+_KANA = _build_classifier(_KANA_RANGES)
 
 def is_hiragana(string: str) -> bool:
-    return all(_is_one_hiragana(char) for char in string)
+    return _HIRAGANA.fullmatch(string) is not None
 
 def is_katakana(string: str) -> bool:
-    return all(_is_one_katakana(char) for char in string)
+    return _KATAKANA.fullmatch(string) is not None
 
 def is_kana(string: str) -> bool:
-    return all(_is_one_kana(char) for char in string)
+    return _KANA.fullmatch(string) is not None
+
+_KANJI_CHARS = '\u3005-\u3007\u3400-\u4DBF\u4E00-\u9FFF\uF900-\uFAFF\U00020000-\U0002FA1F'
+_HIRAGANA_CHARS = '\u3041-\u309E'
+_KATAKANA_CHARS = '\u30A0-\u30FE'
+_LATIN_CHARS = 'A-Za-z\u00C0-\u024F\uFF21-\uFF3A\uFF41-\uFF5A'
+_DIGIT_CHARS = '0-9\uFF10-\uFF19'
+
+# apostrophes and dashes belong to latin runs so that romaji like kin'youbi
+# or depa-to stay in one piece
+_LATIN_RUN = f"[{_LATIN_CHARS}][{_LATIN_CHARS}'\\-]*"
+
+_SCRIPTS = {
+    'KANJI': f'[{_KANJI_CHARS}]+',
+    'HIRAGANA': f'[{_HIRAGANA_CHARS}]+',
+    'KATAKANA': f'[{_KATAKANA_CHARS}]+',
+    'LATIN': _LATIN_RUN,
+    'DIGIT': f'[{_DIGIT_CHARS}]+',
+    'OTHER': f'[^{_KANJI_CHARS}{_HIRAGANA_CHARS}{_KATAKANA_CHARS}{_LATIN_CHARS}{_DIGIT_CHARS}]+',
+}
+
+Script = Enum('Script', (
+    'KANJI',
+    'HIRAGANA',
+    'KATAKANA',
+    'LATIN',
+    'DIGIT',
+    'OTHER',
+))
+
+_SEGMENTER = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in _SCRIPTS.items()),
+    re.DOTALL
+)
+
+# spans converted by the passthrough mode, for each target of the conversion
+_PASSTHROUGH_SOURCES = (
+    re.compile(f'[{_HIRAGANA_CHARS}{_KATAKANA_CHARS}]+'),
+    re.compile(f'(?:{_LATIN_RUN}|[{_KATAKANA_CHARS}])+'),
+    re.compile(f'(?:{_LATIN_RUN}|[{_HIRAGANA_CHARS}])+'),
+)
+
+def segment(string: str) -> List[Tuple[Script, str]]:
+    return [
+        (Script[cast(str, match.lastgroup)], match.group())
+        for match in _SEGMENTER.finditer(string)
+    ]
+
+# number of code points classified at once by numpy, bounding the size of
+# the code point matrix
+_BATCH_CELLS = 1 << 22
+
+def _classify_block(
+    strings: List[str],
+    block: List[int],
+    ranges: Tuple[Tuple[int, int], ...],
+    results: List[bool]
+) -> None:
+
+    rows = [strings[index] for index in block]
+    # one row of UCS-4 code points per string, right-padded with zeros
+    codes: Any = np.array(rows, dtype=np.str_).view(np.uint32).reshape(len(rows), -1)
+    lengths: Any = np.fromiter(map(len, rows), dtype=np.intp, count=len(rows))
+    inside: Any = np.arange(codes.shape[1]) >= lengths[:, np.newaxis]
+    for low, high in ranges:
+        inside |= (codes >= low) & (codes <= high)
+    for index, result in zip(block, inside.all(axis=1).tolist()):
+        results[index] = result
+
+def _classify_batch(
+    strings: Iterable[str],
+    classifier: Pattern[str],
+    ranges: Tuple[Tuple[int, int], ...]
+) -> List[bool]:
+
+    strings = list(strings)
+
+    if np is None:
+        return [classifier.fullmatch(string) is not None for string in strings]
+
+    # strings of similar lengths are classified together, so that padding
+    # them to the longest one keeps the matrix within _BATCH_CELLS
+    results = [False] * len(strings)
+    block: List[int] = []
+    for index in sorted(range(len(strings)), key=lambda index: len(strings[index])):
+        width = max(len(strings[index]), 1)
+        if width > _BATCH_CELLS:
+            results[index] = classifier.fullmatch(strings[index]) is not None
+            continue
+        if (len(block) + 1) * width > _BATCH_CELLS:
+            _classify_block(strings, block, ranges, results)
+            block = []
+        block.append(index)
+    if block:
+        _classify_block(strings, block, ranges, results)
+    return results
+
+def is_hiragana_batch(strings: Iterable[str]) -> List[bool]:
+    return _classify_batch(strings, _HIRAGANA, _HIRAGANA_RANGES)
+
+def is_katakana_batch(strings: Iterable[str]) -> List[bool]:
+    return _classify_batch(strings, _KATAKANA, _KATAKANA_RANGES)
+
+def is_kana_batch(strings: Iterable[str]) -> List[bool]:
+    return _classify_batch(strings, _KANA, _KANA_RANGES)
+
+# hiragana (including small kana, ゔ, ゕ and ゖ) and the iteration marks sit
+# exactly 0x60 code points below their katakana counterparts
+_HIRAGANA_TO_KATAKANA = {
+    code: code + 0x60
+    for code in itertools.chain(range(0x3041, 0x3097), range(0x309D, 0x309F))
+}
+_KATAKANA_TO_HIRAGANA = {value: key for key, value in _HIRAGANA_TO_KATAKANA.items()}
+
+def hiragana_to_katakana(string: str) -> str:
+    return string.translate(_HIRAGANA_TO_KATAKANA)
+
+def katakana_to_hiragana(string: str) -> str:
+    return string.translate(_KATAKANA_TO_HIRAGANA)
+
+# translation tables for the kana targets of a conversion
+_KANA_TABLES: Tuple[Dict[int, int], ...] = ({}, _KATAKANA_TO_HIRAGANA, _HIRAGANA_TO_KATAKANA)
 
 _SYMBOLS = [
     ['a',       'あ',       'ア'],
@@ -176,70 +330,433 @@ def _build_enhancer(
         return symbols
     return _enhance
 
-def _on_error_fail(todecode: str, string: str) -> Tuple[str, List[str]]:
-    raise ConversionError(f"Cannot convert {todecode} in {string}")
+def _respell(
+    symbols: Iterable[List[str]],
+    spellings: Dict[str, str]
+) -> List[List[str]]:
+    return [
+        [spellings.get(romaji, romaji), hiragana, katakana]
+        for romaji, hiragana, katakana in symbols
+    ]
+
+class Scheme:
+    """A romanization scheme."""
+
+    # symbols are converted both ways, inputs are romaji spellings that are
+    # only read and outputs are kana that are only written as romaji
+
+    def __init__(
+        self,
+        symbols: Iterable[List[str]],
+        *enhancers: Callable[[Iterable[List[str]]], Iterable[List[str]]],
+        inputs: Optional[Iterable[List[str]]]=None,
+        outputs: Optional[Iterable[List[str]]]=None
+    ) -> None:
+
+        self.symbols = list(symbols)
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.enhancer = _build_enhancer(*enhancers)
+
+_SCHEMES: Dict[str, Scheme] = {}
+
+def register_scheme(name: str, scheme: Scheme) -> None:
+    with _CONVERTER_LOCK:
+        _SCHEMES[name] = scheme
+        _CONVERTERS.pop(name, None)
+
+_KUNREI_SPELLINGS = {
+    'cha': 'tya',
+    'che': 'tye',
+    'chi': 'ti',
+    'cho': 'tyo',
+    'chu': 'tyu',
+    'du': 'dwu',
+    'fu': 'hu',
+    'ja': 'zya',
+    'je': 'zye',
+    'ji': 'zi',
+    'jo': 'zyo',
+    'ju': 'zyu',
+    'sha': 'sya',
+    'she': 'sye',
+    'shi': 'si',
+    'sho': 'syo',
+    'shu': 'syu',
+    'tsu': 'tu',
+    'tu': 'twu',
+}
+
+_KUNREI_OUTPUTS = [
+    ['zi',      'ぢ',       'ヂ'],
+    ['zyo',     'ぢょ',     'ヂョ'],
+    ['zu',      'づ',       'ヅ'],
+    ['o',       'を',       'ヲ'],
+]
+
+_NIHON_SYMBOLS = [
+    ['di',      'ぢ',       'ヂ'],
+    ['dyo',     'ぢょ',     'ヂョ'],
+    ['du',      'づ',       'ヅ'],
+]
+
+_IME_SPELLINGS = {
+    'du': 'dwu',
+    'tu': 'twu',
+}
+
+_IME_INPUTS = [
+    ['di',      'ぢ',       'ヂ'],
+    ['du',      'づ',       'ヅ'],
+    ['hu',      'ふ',       'フ'],
+    ['jya',     'じゃ',     'ジャ'],
+    ['jye',     'じぇ',     'ジェ'],
+    ['jyo',     'じょ',     'ジョ'],
+    ['jyu',     'じゅ',     'ジュ'],
+    ['la',      'ぁ',       'ァ'],
+    ['le',      'ぇ',       'ェ'],
+    ['li',      'ぃ',       'ィ'],
+    ['lo',      'ぉ',       'ォ'],
+    ['ltu',     'っ',       'ッ'],
+    ['lu',      'ぅ',       'ゥ'],
+    ['lya',     'ゃ',       'ャ'],
+    ['lyo',     'ょ',       'ョ'],
+    ['lyu',     'ゅ',       'ュ'],
+    ['nn',      'ん',       'ン'],
+    ['si',      'し',       'シ'],
+    ['sya',     'しゃ',     'シャ'],
+    ['sye',     'しぇ',     'シェ'],
+    ['syo',     'しょ',     'ショ'],
+    ['syu',     'しゅ',     'シュ'],
+    ['ti',      'ち',       'チ'],
+    ['tu',      'つ',       'ツ'],
+    ['tya',     'ちゃ',     'チャ'],
+    ['tye',     'ちぇ',     'チェ'],
+    ['tyo',     'ちょ',     'チョ'],
+    ['tyu',     'ちゅ',     'チュ'],
+    ['xa',      'ぁ',       'ァ'],
+    ['xe',      'ぇ',       'ェ'],
+    ['xi',      'ぃ',       'ィ'],
+    ['xo',      'ぉ',       'ォ'],
+    ['xtu',     'っ',       'ッ'],
+    ['xu',      'ぅ',       'ゥ'],
+    ['xya',     'ゃ',       'ャ'],
+    ['xyo',     'ょ',       'ョ'],
+    ['xyu',     'ゅ',       'ュ'],
+    ['zi',      'じ',       'ジ'],
+    ['zya',     'じゃ',     'ジャ'],
+    ['zye',     'じぇ',     'ジェ'],
+    ['zyo',     'じょ',     'ジョ'],
+    ['zyu',     'じゅ',     'ジュ'],
+]
+
+def _without(symbols: Iterable[List[str]], *romaji: str) -> List[List[str]]:
+    return [symbol for symbol in symbols if symbol[0] not in romaji]
 
-def _on_error_ignore(todecode: str, _: str) -> Tuple[str, List[str]]:
-    sub = todecode[0]
-    return sub, [sub, sub, sub]
+def _on_error_fail(string: str, pos: int) -> Tuple[int, List[str]]:
+    raise ConversionError(f"Cannot convert {string[pos:]} in {string}")
+
+def _on_error_ignore(string: str, pos: int) -> Tuple[int, List[str]]:
+    sub = string[pos]
+    return pos + 1, [sub, sub, sub]
 
 _ERRORS = {
     "fail": _on_error_fail,
     "ignore": _on_error_ignore,
+    # only differs from ignore once the runs of other scripts are copied
+    # without being scanned, see _scan_passthrough
+    "passthrough": _on_error_ignore,
 }
 
+# a trie node maps the next character to its child node; the None key holds
+# the symbol spelled by the path leading to the node, if any
+_Node = Dict[Optional[str], Any]
+
+def _build_trie(symbols: Dict[str, List[str]]) -> _Node:
+    root: _Node = {}
+    for sub, symbol in symbols.items():
+        node = root
+        for char in sub:
+            node = node.setdefault(char, {})
+        node[None] = symbol
+    return root
+
+def _chunks(strings: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(strings)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# converter of a batch worker process, set once by _init_worker
+_WORKER_CONVERTER: Optional['Converter'] = None
+
+def _init_worker(converter: 'Converter') -> None:
+    global _WORKER_CONVERTER # pylint: disable=global-statement
+    _WORKER_CONVERTER = converter
+
+def _convert_chunk(strings: List[str], index: int, errors: Optional[str]) -> List[str]:
+    assert _WORKER_CONVERTER is not None
+    # pylint: disable=protected-access
+    return [_WORKER_CONVERTER._convert(string, index, errors) for string in strings]
+
 class Converter:
 
-    def __init__(self) -> None:
+    def __init__(self, scheme: Optional[str]=None) -> None:
+
+        name = scheme or 'hepburn'
+        if name not in _SCHEMES:
+            raise ValueError(f'Unknown romanization scheme {name}')
+        table = _SCHEMES[name]
 
         self._symbols: Dict[str, List[str]] = {}
 
-        enhancer = _build_enhancer(_tsu)
+        def _add(sub: str, symbol: List[str]) -> None:
+            if sub in self._symbols:
+                raise Exception(f'duplicate symbol {sub}')
+            self._symbols[sub] = symbol
 
-        for symbol in enhancer(_SYMBOLS):
+        for symbol in table.enhancer(table.symbols):
             romaji, hiragana, katakana = symbol
+            _add(romaji, symbol)
+            _add(hiragana, symbol)
+            _add(katakana, symbol)
 
-            if romaji in self._symbols:
-                raise Exception(f'duplicate symbol {romaji}')
-            self._symbols[romaji] = symbol
+        for symbol in table.enhancer(table.inputs):
+            _add(symbol[0], symbol)
 
-            if hiragana in self._symbols:
-                raise Exception(f'duplicate symbol {hiragana}')
-            self._symbols[hiragana] = symbol
-
-            if katakana in self._symbols:
-                raise Exception(f'duplicate symbol {katakana}')
-            self._symbols[katakana] = symbol
+        for symbol in table.enhancer(table.outputs):
+            _add(symbol[1], symbol)
+            _add(symbol[2], symbol)
 
         self._symbols['/'] = ['/', '・', '・']
         self._symbols['・'] = ['/', '・', '・']
         self._symbols['-'] = ['-', 'ー', 'ー']
         self._symbols['ー'] = ['-', 'ー', 'ー']
 
-    def next_symbol(self, string: str) -> Tuple[Optional[str], Optional[List[str]]]:
+        self._trie = _build_trie(self._symbols)
+        self._longest = max(map(len, self._symbols))
+        self._translatable = frozenset(
+            char for char, symbol in self._symbols.items()
+            if len(char) == 1 and
+            symbol[1:] == [katakana_to_hiragana(char), hiragana_to_katakana(char)]
+        )
+
+    def _match(self, string: str, pos: int) -> Tuple[int, Optional[List[str]]]:
+
+        node = self._trie
+        end, symbol = pos, None
+        for cur in range(pos, len(string)):
+            child: Optional[_Node] = node.get(string[cur])
+            if child is None:
+                break
+            node = child
+            if None in node:
+                end, symbol = cur + 1, node[None]
+        return end, symbol
 
-        for length in range(4, 0, -1):
-            sub = string[0:length]
-            if sub in self._symbols:
-                return sub, self._symbols[sub]
-        return None, None
+    def next_symbol(self, string: str) -> Tuple[Optional[str], Optional[List[str]]]:
 
-    def _convert(self, string: str, index: int, errors: Optional[str]=None) -> str:
+        end, symbol = self._match(string, 0)
+        if symbol is None:
+            return None, None
+        return string[:end], symbol
 
-        if errors is None:
-            errors = "fail"
+    def _scan(
+        self,
+        string: str,
+        index: int,
+        errors: Optional[str]=None,
+        final: bool=True,
+        starts: Optional['array[int]']=None
+    ) -> Tuple[List[str], int]:
 
-        todecode = string
+        on_error = _ERRORS[errors or "fail"]
+        length = len(string)
 
         symbols = []
-        while todecode:
-            sub, symbol = self.next_symbol(todecode)
-            if (sub is None) or (symbol is None):
-                sub, symbol = _ERRORS[errors](todecode, string)
+        pos = 0
+        while pos < length:
+            # walk the trie as far as the input allows, remembering the
+            # longest symbol seen on the way
+            node = self._trie
+            end, symbol = pos, None
+            cur = pos
+            while cur < length:
+                child: Optional[_Node] = node.get(string[cur])
+                if child is None:
+                    break
+                node = child
+                cur += 1
+                if None in node:
+                    end, symbol = cur, node[None]
+            else:
+                # the input ran out while a longer symbol was still possible:
+                # unless this is the end of the text, wait for more input
+                if not final and len(node) > (None in node):
+                    break
+            if symbol is None:
+                end, symbol = on_error(string, pos)
             symbols.append(symbol[index])
-            todecode = todecode[len(sub):]
+            if starts is not None:
+                starts.append(pos)
+            pos = end
+
+        return symbols, pos
+
+    def _convert(self, string: str, index: int, errors: Optional[str]=None) -> str:
 
-        return ''.join(symbols)
+        if errors == "passthrough":
+            convert = (self.to_romaji, self.to_hiragana, self.to_katakana)[index]
+            return _PASSTHROUGH_SOURCES[index].sub(
+                lambda match: convert(match.group(), "ignore"), string
+            )
+
+        # kana converting on their own to their translation do so in any
+        # sequence too, so strings made of them only skip the symbol table
+        if index and self._translatable.issuperset(string):
+            return string.translate(_KANA_TABLES[index])
+
+        return ''.join(self._scan(string, index, errors)[0])
+
+    def _scan_passthrough(
+        self,
+        string: str,
+        index: int,
+        starts: 'array[int]'
+    ) -> List[str]:
+
+        # the runs of the source scripts are scanned, ignoring errors, and
+        # the other characters copied one by one
+        symbols: List[str] = []
+        pos = 0
+        for match in _PASSTHROUGH_SOURCES[index].finditer(string):
+            symbols.extend(string[pos:match.start()])
+            starts.extend(range(pos, match.start()))
+            run_starts = array('I')
+            symbols.extend(self._scan(match.group(), index, "ignore", starts=run_starts)[0])
+            starts.extend(start + match.start() for start in run_starts)
+            pos = match.end()
+        symbols.extend(string[pos:])
+        starts.extend(range(pos, len(string)))
+        return symbols
+
+    def _passthrough_end(self, string: str, index: int) -> int:
+        # how much of a chunk more input can't change: a run reaching its end
+        # may go on, so it is only cut at the start of one of its symbols
+        # that would also start a run of its own
+        last = None
+        for last in _PASSTHROUGH_SOURCES[index].finditer(string):
+            pass
+        if last is None or last.end() < len(string):
+            return len(string)
+        starts = array('I')
+        end = self._scan(last.group(), index, "ignore", final=False, starts=starts)[1]
+        starts.append(end)
+        for start in reversed(starts):
+            cut = last.start() + start
+            if cut < len(string) and _PASSTHROUGH_SOURCES[index].match(string, cut):
+                return cut
+        return last.start()
+
+    def _convert_aligned(
+        self,
+        string: str,
+        index: int,
+        errors: Optional[str]=None
+    ) -> Tuple[str, 'array[int]', 'array[int]']:
+
+        if index and self._translatable.issuperset(string):
+            # these kana are converted character for character
+            offsets = array('I', range(len(string) + 1))
+            return string.translate(_KANA_TABLES[index]), offsets, array('I', offsets)
+
+        sources = array('I')
+        if errors == "passthrough":
+            symbols = self._scan_passthrough(string, index, sources)
+        else:
+            symbols, _ = self._scan(string, index, errors, starts=sources)
+        sources.append(len(string))
+        targets = array('I', [0])
+        targets.extend(itertools.accumulate(map(len, symbols)))
+        return ''.join(symbols), sources, targets
+
+    def _convert_stream(
+        self,
+        stream: Union[TextIO, Iterable[str]],
+        index: int,
+        errors: Optional[str]=None,
+        chunksize: int=65536
+    ) -> Iterator[str]:
+
+        if hasattr(stream, 'read'):
+            chunks: Iterable[str] = iter(
+                functools.partial(cast(TextIO, stream).read, chunksize), ''
+            )
+        else:
+            chunks = cast(Iterable[str], stream)
+
+        # only the few characters that may still start a longer symbol are
+        # carried from one chunk to the next
+        carry = ''
+        for chunk in chunks:
+            buffer = carry + chunk
+            if errors == "passthrough":
+                pos = self._passthrough_end(buffer, index)
+                converted = self._convert(buffer[:pos], index, errors)
+            else:
+                symbols, pos = self._scan(buffer, index, errors, final=False)
+                converted = ''.join(symbols)
+            carry = buffer[pos:]
+            if converted:
+                yield converted
+
+        if carry:
+            yield self._convert(carry, index, errors)
+
+    def _convert_many(
+        self,
+        strings: Iterable[str],
+        index: int,
+        errors: Optional[str]=None,
+        workers: Optional[int]=None,
+        chunksize: int=4096
+    ) -> Iterator[str]:
+
+        cache: Dict[str, str] = {}
+
+        if workers is None or workers <= 1:
+            for string in strings:
+                result = cache.get(string)
+                if result is None:
+                    result = cache[string] = self._convert(string, index, errors)
+                yield result
+            return
+
+        # chunks are converted out of process and yielded in submission order;
+        # at most two chunks per worker are in flight so memory stays bounded
+        pool = concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(self,)
+        )
+        pending: Deque[Tuple[List[str], List[str], concurrent.futures.Future]] = \
+            collections.deque()
+        try:
+            chunks = _chunks(strings, chunksize)
+            while True:
+                for chunk in chunks:
+                    todo = [string for string in dict.fromkeys(chunk) if string not in cache]
+                    pending.append((chunk, todo, pool.submit(_convert_chunk, todo, index, errors)))
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                chunk, todo, future = pending.popleft()
+                cache.update(zip(todo, future.result()))
+                for string in chunk:
+                    yield cache[string]
+        finally:
+            pool.shutdown(cancel_futures=True)
 
     def to_romaji(self, string: str, errors: Optional[str]=None) -> str:
 
@@ -253,14 +770,248 @@ class Converter:
 
         return self._convert(string, 2, errors)
 
-def to_katakana(string: str, errors: Optional[str]=None) -> str:
-    converter = Converter()
-    return converter.to_katakana(string, errors)
-
-def to_hiragana(string: str, errors: Optional[str]=None) -> str:
-    converter = Converter()
-    return converter.to_hiragana(string, errors)
-
-def to_romaji(string: str, errors: Optional[str]=None) -> str:
-    converter = Converter()
-    return converter.to_romaji(string, errors)
+    def to_romaji_aligned(
+        self,
+        string: str,
+        errors: Optional[str]=None
+    ) -> Tuple[str, 'array[int]', 'array[int]']:
+
+        return self._convert_aligned(string, 0, errors)
+
+    def to_hiragana_aligned(
+        self,
+        string: str,
+        errors: Optional[str]=None
+    ) -> Tuple[str, 'array[int]', 'array[int]']:
+
+        return self._convert_aligned(string, 1, errors)
+
+    def to_katakana_aligned(
+        self,
+        string: str,
+        errors: Optional[str]=None
+    ) -> Tuple[str, 'array[int]', 'array[int]']:
+
+        return self._convert_aligned(string, 2, errors)
+
+    def to_romaji_batch(
+        self,
+        strings: Iterable[str],
+        errors: Optional[str]=None,
+        workers: Optional[int]=None
+    ) -> Iterator[str]:
+
+        return self._convert_many(strings, 0, errors, workers)
+
+    def to_hiragana_batch(
+        self,
+        strings: Iterable[str],
+        errors: Optional[str]=None,
+        workers: Optional[int]=None
+    ) -> Iterator[str]:
+
+        return self._convert_many(strings, 1, errors, workers)
+
+    def to_katakana_batch(
+        self,
+        strings: Iterable[str],
+        errors: Optional[str]=None,
+        workers: Optional[int]=None
+    ) -> Iterator[str]:
+
+        return self._convert_many(strings, 2, errors, workers)
+
+    def to_romaji_stream(
+        self,
+        stream: Union[TextIO, Iterable[str]],
+        errors: Optional[str]=None
+    ) -> Iterator[str]:
+
+        return self._convert_stream(stream, 0, errors)
+
+    def to_hiragana_stream(
+        self,
+        stream: Union[TextIO, Iterable[str]],
+        errors: Optional[str]=None
+    ) -> Iterator[str]:
+
+        return self._convert_stream(stream, 1, errors)
+
+    def to_katakana_stream(
+        self,
+        stream: Union[TextIO, Iterable[str]],
+        errors: Optional[str]=None
+    ) -> Iterator[str]:
+
+        return self._convert_stream(stream, 2, errors)
+
+_CONVERTERS: Dict[str, Converter] = {}
+_CONVERTER_LOCK = threading.Lock()
+
+def _get_converter(scheme: Optional[str]=None) -> Converter:
+    # tables are read-only once built, so a single instance per scheme can be
+    # shared by every thread; the lock only guards the first construction
+    name = scheme or 'hepburn'
+    converter = _CONVERTERS.get(name)
+    if converter is None:
+        with _CONVERTER_LOCK:
+            converter = _CONVERTERS.get(name)
+            if converter is None:
+                converter = _CONVERTERS[name] = Converter(name)
+    return converter
+
+register_scheme('hepburn', Scheme(_SYMBOLS, _tsu))
+register_scheme('kunrei', Scheme(
+    _respell(_without(_SYMBOLS, 'dji', 'djo', 'dzu', 'wo'), _KUNREI_SPELLINGS),
+    _tsu,
+    outputs=_KUNREI_OUTPUTS,
+))
+register_scheme('nihon', Scheme(
+    _respell(_without(_SYMBOLS, 'dji', 'djo', 'dzu'), _KUNREI_SPELLINGS) + _NIHON_SYMBOLS,
+    _tsu,
+))
+register_scheme('ime', Scheme(
+    _respell(_SYMBOLS, _IME_SPELLINGS),
+    _tsu,
+    inputs=_IME_INPUTS,
+))
+
+def to_katakana(string: str, errors: Optional[str]=None, scheme: Optional[str]=None) -> str:
+    return _get_converter(scheme).to_katakana(string, errors)
+
+def to_hiragana(string: str, errors: Optional[str]=None, scheme: Optional[str]=None) -> str:
+    return _get_converter(scheme).to_hiragana(string, errors)
+
+def to_romaji(string: str, errors: Optional[str]=None, scheme: Optional[str]=None) -> str:
+    return _get_converter(scheme).to_romaji(string, errors)
+
+def to_katakana_aligned(
+    string: str,
+    errors: Optional[str]=None,
+    scheme: Optional[str]=None
+) -> Tuple[str, 'array[int]', 'array[int]']:
+    return _get_converter(scheme).to_katakana_aligned(string, errors)
+
+def to_hiragana_aligned(
+    string: str,
+    errors: Optional[str]=None,
+    scheme: Optional[str]=None
+) -> Tuple[str, 'array[int]', 'array[int]']:
+    return _get_converter(scheme).to_hiragana_aligned(string, errors)
+
+def to_romaji_aligned(
+    string: str,
+    errors: Optional[str]=None,
+    scheme: Optional[str]=None
+) -> Tuple[str, 'array[int]', 'array[int]']:
+    return _get_converter(scheme).to_romaji_aligned(string, errors)
+
+def to_katakana_batch(
+    strings: Iterable[str],
+    errors: Optional[str]=None,
+    workers: Optional[int]=None,
+    scheme: Optional[str]=None
+) -> Iterator[str]:
+    return _get_converter(scheme).to_katakana_batch(strings, errors, workers)
+
+def to_hiragana_batch(
+    strings: Iterable[str],
+    errors: Optional[str]=None,
+    workers: Optional[int]=None,
+    scheme: Optional[str]=None
+) -> Iterator[str]:
+    return _get_converter(scheme).to_hiragana_batch(strings, errors, workers)
+
+def to_romaji_batch(
+    strings: Iterable[str],
+    errors: Optional[str]=None,
+    workers: Optional[int]=None,
+    scheme: Optional[str]=None
+) -> Iterator[str]:
+    return _get_converter(scheme).to_romaji_batch(strings, errors, workers)
+
+def to_katakana_stream(
+    stream: Union[TextIO, Iterable[str]],
+    errors: Optional[str]=None,
+    scheme: Optional[str]=None
+) -> Iterator[str]:
+    return _get_converter(scheme).to_katakana_stream(stream, errors)
+
+def to_hiragana_stream(
+    stream: Union[TextIO, Iterable[str]],
+    errors: Optional[str]=None,
+    scheme: Optional[str]=None
+) -> Iterator[str]:
+    return _get_converter(scheme).to_hiragana_stream(stream, errors)
+
+def to_romaji_stream(
+    stream: Union[TextIO, Iterable[str]],
+    errors: Optional[str]=None,
+    scheme: Optional[str]=None
+) -> Iterator[str]:
+    return _get_converter(scheme).to_romaji_stream(stream, errors)
+
+class IncrementalConverter:
+    """Converts romaji to kana as it is typed."""
+
+    def __init__(self, katakana: bool=False, scheme: Optional[str]=None) -> None:
+
+        self._converter = _get_converter(scheme)
+        self._index = 2 if katakana else 1
+        # resolved (romaji, kana) pairs, and the romaji tail that may still
+        # grow into a longer symbol
+        self._segments: List[Tuple[str, str]] = []
+        self._pending = ''
+
+    def _resolve(self, final: bool=False) -> None:
+        # pylint: disable=protected-access
+        starts: 'array[int]' = array('I')
+        symbols, pos = self._converter._scan(
+            self._pending, self._index, 'ignore', final=final, starts=starts
+        )
+        starts.append(pos)
+        for symbol, start, end in zip(symbols, starts, starts[1:]):
+            self._segments.append((self._pending[start:end], symbol))
+        self._pending = self._pending[pos:]
+
+    def append(self, string: str) -> None:
+        self._pending += string
+        self._resolve()
+
+    def delete(self, count: int=1) -> None:
+        for _ in range(count):
+            if not self._pending:
+                if not self._segments:
+                    break
+                self._pending = self._segments.pop()[0]
+            self._pending = self._pending[:-1]
+
+        # symbols resolved near the end may have depended on the deleted
+        # characters: take them back and resolve them again
+        longest = self._converter._longest # pylint: disable=protected-access
+        while self._segments and len(self._pending) < longest:
+            self._pending = self._segments.pop()[0] + self._pending
+        self._resolve()
+
+    def clear(self) -> None:
+        self._segments = []
+        self._pending = ''
+
+    def flush(self) -> str:
+        self._resolve(final=True)
+        return self.kana
+
+    @property
+    def kana(self) -> str:
+        return ''.join(kana for _, kana in self._segments)
+
+    @property
+    def pending(self) -> str:
+        return self._pending
+
+    @property
+    def romaji(self) -> str:
+        return ''.join(romaji for romaji, _ in self._segments) + self._pending
+
+    def __str__(self) -> str:
+        return self.kana + self._pending
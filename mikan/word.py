@@ -1,4 +1,4 @@
-from typing import Tuple, List, Union
+from typing import Dict, Tuple, List, Mapping, Optional, Union
 
 from mikan.base import BaseWord
 from mikan.writing import Writing
@@ -11,30 +11,44 @@ class Word(BaseWord):
 
     def __init__(
         self,
-        *args: Union[str, Writing, BaseWord]
+        *args: Union[str, Writing, BaseWord],
+        weights: Optional[Mapping[str, float]]=None
     ) -> None:
 
         super().__init__()
 
-        self._writings: List[Writing] = []
+        writings: List[Writing] = []
+        # the higher the weight of a writing, the more it is preferred
+        self._weights: Dict[str, float] = {}
         for wri in args:
             if isinstance(wri, BaseWord):
-                self._writings.extend(wri.writings)
+                for writing in wri.writings:
+                    writings.append(writing)
+                    if wri.weight(writing):
+                        self._weights[writing] = wri.weight(writing)
             else:
-                self._writings.append(Writing.create(wri))
+                writings.append(Writing.create(wri))
 
-        if len(self._writings) == 0:
+        if len(writings) == 0:
             raise ValueError('No writing provided')
 
+        self._writings: Tuple[Writing, ...] = tuple(writings)
+        if weights is not None:
+            self._weights.update(weights)
+
     def __add__(self, other: Union[str, BaseWord]) -> BaseWord:
         if isinstance(other, BaseWord):
             return mikan.compound.Compound.create((self, other))
         writings = [writing + other for writing in self._writings]
-        return Word(*writings)
+        weights = {writing + other: weight for writing, weight in self._weights.items()}
+        return Word(*writings, weights=weights)
+
+    def weight(self, writing: str) -> float:
+        return self._weights.get(writing, 0)
 
     @property
     def writings(self) -> List[Writing]:
-        return self._writings
+        return list(self._writings)
 
     def split_okurigana(self, count: int) -> Tuple['Word', str]:
         okurigana = None
@@ -1,24 +1,73 @@
-from typing import List, Type
+from typing import List, Optional, Type
+import weakref
 
-__all__ = ['Writing']
+__all__ = ['Writing', 'enable_interning', 'disable_interning']
+
+# when interning is enabled, writings with the same string share one instance
+# for as long as some word holds on to it
+_POOL: Optional['weakref.WeakValueDictionary[str, Writing]'] = None
+_POOL_MAXSIZE = 0
+
+def enable_interning(maxsize: int=1 << 20) -> None:
+    global _POOL, _POOL_MAXSIZE # pylint: disable=global-statement
+    _POOL = weakref.WeakValueDictionary()
+    _POOL_MAXSIZE = maxsize
+
+def disable_interning() -> None:
+    global _POOL # pylint: disable=global-statement
+    _POOL = None
+
+def _new_writing(kind: Type['Writing'], string: str) -> 'Writing':
+    writing = str.__new__(kind, string)
+    if _POOL is not None and len(_POOL) < _POOL_MAXSIZE:
+        _POOL[string] = writing
+    return writing
 
 class Writing(str):
 
+    __slots__ = ('__weakref__',)
+
     subclasses: List[Type['Writing']] = []
 
     def __init_subclass__(cls) -> None:
         cls.subclasses.append(cls)
 
+    @classmethod
+    def accepts(cls, string: str) -> bool:
+        # subclasses should override this with a cheaper test that doesn't
+        # build an instance
+        try:
+            cls(string)
+        except ValueError:
+            return False
+        return True
+
+    @classmethod
+    def accepts_concatenation(cls, prefix: str, suffix: str) -> bool:
+        return cls.accepts(prefix + suffix)
+
     @classmethod
     def create(cls, something: object) -> 'Writing':
         string = str(something)
-        for subclass in cls.subclasses:
-            try:
-                writing = subclass(string)
+        if _POOL is not None:
+            writing = _POOL.get(string)
+            if writing is not None:
                 return writing
-            except ValueError:
-                pass
-        return Writing(string)
+        for subclass in cls.subclasses:
+            if subclass.accepts(string):
+                return _new_writing(subclass, string)
+        return _new_writing(Writing, string)
 
     def __add__(self, other: object) -> 'Writing':
-        return Writing.create(str(self) + str(other))
+        # keep writings as they are, so subclasses can tell what they already
+        # know about both parts
+        suffix = other if isinstance(other, str) else str(other)
+        string = str.__add__(self, suffix)
+        if _POOL is not None:
+            writing = _POOL.get(string)
+            if writing is not None:
+                return writing
+        for subclass in Writing.subclasses:
+            if subclass.accepts_concatenation(self, suffix):
+                return _new_writing(subclass, string)
+        return _new_writing(Writing, string)
@@ -0,0 +1,258 @@
+import random
+
+import pytest
+from mikan import (
+    Compound, Counter, Lattice, Number, PersonCounter, Reading, Word, combine_cache_info,
+    VariantPolicy, disable_combine_cache, enable_combine_cache
+)
+from mikan.combine import COUNTER_SOUND_CHANGES, DefaultCombine, RendakuCombine
+from mikan.number import Digit, Hyaku, Juu, MyriadCompound
+
+class CountingCombine(DefaultCombine):
+
+    def __init__(self):
+        self.calls = 0
+
+    def lattice(self, words):
+        self.calls += 1
+        return super().lattice(words)
+
+def test_compound_memoized():
+    combine = CountingCombine()
+    compound = Compound([Word('日本', 'にほん'), Word('料理', 'りょうり')], combine=combine)
+    assert compound.writings == ['日本料理', 'にほんりょうり']
+    assert compound.readings == ['にほんりょうり']
+    assert str(compound) == '日本料理'
+    assert compound == Word('日本料理', 'にほんりょうり')
+    assert combine.calls == 1
+
+def test_compound_memoized_str_first():
+    combine = CountingCombine()
+    compound = Compound([Word('日本', 'にほん'), Word('料理', 'りょうり')], combine=combine)
+    assert str(compound) == '日本料理'
+    assert compound.writings == ['日本料理', 'にほんりょうり']
+    assert combine.calls == 1
+
+def test_compound_str_first_budget():
+    word = Word('日本', 'にほん', 'にっぽん')
+    words = Compound([word, word, word], combine=DefaultCombine(limit=2))
+    assert str(words) == '日本日本日本'
+    assert words.writings == ['日本日本日本', 'にほんにほんにほん']
+
+class Animal(Word):
+    pass
+
+class Cat(Animal):
+    pass
+
+class AnimalCompound(Compound):
+
+    operands = ((Animal, Word),)
+
+class CatCompound(Compound):
+
+    operands = ((Cat, Word),)
+
+def test_create_dispatch():
+    assert type(Animal('犬') + Word('小屋')) is AnimalCompound
+    assert type(Cat('猫') + Word('小屋')) is CatCompound
+    assert type(Word('小屋') + Cat('猫')) is Compound
+    assert type(Compound.create([Cat('猫'), Word('小屋'), Word('前')])) is CatCompound
+
+def test_create_dispatch_numbers():
+    hundred = Compound.create([Digit(1), Hyaku()])
+    ten = Compound.create([Digit(1), Juu()])
+    assert type(Compound.create([hundred, ten, Digit(4)])) is MyriadCompound
+    assert type(Compound.create([Digit(1), Digit(2), Digit(3)])) is Compound
+
+def test_long_chain():
+    cat = Word('猫', 'ねこ')
+    words = cat
+    for _ in range(2000):
+        words = words + cat + 'が'
+    assert type(words) is Compound
+    assert str(words) == '猫' + '猫が' * 2000
+    assert words.readings == ['ねこ' + 'ねこが' * 2000]
+
+def test_chain_branches():
+    start = Word('日本', 'にほん') + Word('猫', 'ねこ')
+    first = start + Word('が')
+    second = start + Word('も')
+    assert str(first) == '日本猫が'
+    assert str(second) == '日本猫も'
+    assert str(first + Word('す')) == '日本猫がす'
+    assert str(start) == '日本猫'
+
+def test_lattice():
+    lattice = Lattice([['日本', 'にほん'], ['猫', 'ねこ', 'ネコ']], [['にほん'], ['ねこ']])
+    assert lattice.count() == 7
+    assert list(lattice) == ['日本猫', '日本ねこ', '日本ネコ', 'にほん猫', 'にほんねこ', 'にほんネコ', 'にほんねこ']
+    assert [lattice[i] for i in range(-7, 7)] == list(lattice) * 2
+    assert lattice.first() == '日本猫'
+    assert lattice.sample(random.Random(0)) in list(lattice)
+    with pytest.raises(IndexError):
+        lattice[7] # pylint: disable=pointless-statement
+    with pytest.raises(IndexError):
+        Lattice([['日本'], []]).first()
+
+def test_lattice_long():
+    word = Word('日本', 'にほん', 'にっぽん')
+    words = word
+    for _ in range(100):
+        words = words + word
+    assert words.lattice.count() == 1 + 2 ** 101
+    assert str(words) == '日本' * 101
+    assert words.lattice[-1] == 'にっぽん' * 101
+    assert words.lattice.sample(random.Random(0)).startswith('に')
+
+@pytest.mark.parametrize(
+    "string,accepted,matched",
+    [
+        ('ねこがさんびきいる', True, True),
+        ('ねこがさんひきいる', False, False),
+        ('猫が3匹いる', False, True),
+        ('猫が三匹いる', False, True),
+        ('猫がさんびきいる', False, False),
+        ('ねこが', False, False),
+    ]
+)
+def test_accepts(string, accepted, matched):
+    words = Word('猫', 'ねこ') + 'が' + (Number(3) + Counter('匹', 'ひき')) + Word('いる')
+    assert words.accepts(string) == accepted
+    assert words.matches(string) == matched
+
+def test_accepts_long():
+    word = Word('日本', 'にほん', 'にっぽん')
+    words = word
+    for _ in range(200):
+        words = words + word + (Number(7) + PersonCounter())
+    assert words.accepts('にほん' + 'にっぽんしちにん' * 199 + 'にほんななにん')
+    assert not words.accepts('にほん' + 'にっぽんしちにん' * 199 + 'にほんなな')
+    assert words._evaluated is None # pylint: disable=protected-access
+
+class SideCombine(DefaultCombine):
+
+    def __init__(self):
+        self.sides = []
+
+    def readings(self, words):
+        self.sides.append('readings')
+        return super().readings(words)
+
+    def kanji_writings(self, words):
+        self.sides.append('kanji')
+        return super().kanji_writings(words)
+
+def test_evaluation_sides():
+    combine = SideCombine()
+    compound = Compound([Word('日本', 'にほん', 'にっぽん'), Word('料理', 'りょうり')], combine=combine)
+    assert compound.readings == ['にほんりょうり', 'にっぽんりょうり']
+    assert combine.sides == ['readings']
+    assert compound.kanji_writings == ['日本料理']
+    assert compound.readings == ['にほんりょうり', 'にっぽんりょうり']
+    assert combine.sides == ['readings', 'kanji']
+
+def test_kana_compound():
+    compound = Word('ねこ') + Word('です')
+    assert compound.writings == ['ねこです']
+    assert compound.readings == ['ねこです']
+    assert compound.kanji_writings == []
+
+def test_combine_cache():
+    enable_combine_cache()
+    try:
+        words1 = Word('猫', 'ねこ') + 'が' + (Number(3) + Counter('匹', 'ひき'))
+        assert words1.writings == ['猫が3匹', '猫が三匹', 'ねこがさんびき']
+        misses = combine_cache_info().misses
+        words2 = Word('猫', 'ねこ') + 'が' + (Number(3) + Counter('匹', 'ひき'))
+        assert words2.writings == words1.writings
+        assert words2.writings[0] is words1.writings[0]
+        info = combine_cache_info()
+        assert info.misses == misses
+        assert info.hits > 0
+        assert (Number(3) + PersonCounter()).readings == ['さんにん']
+        assert (Number(7) + PersonCounter()).readings == ['ななにん', 'しちにん']
+    finally:
+        disable_combine_cache()
+    assert combine_cache_info().currsize == 0
+
+def test_combine_cache_maxsize():
+    enable_combine_cache(maxsize=2)
+    try:
+        for value in range(10):
+            assert str(Number(value + 1) + Counter('本', 'ほん')) == str(value + 1) + '本'
+        assert combine_cache_info().currsize == 2
+    finally:
+        disable_combine_cache()
+
+@pytest.mark.parametrize(
+    "reading1,reading2,expected",
+    [
+        ('いち', 'ほん', ['いっぽん']),
+        ('さん', 'ほん', ['さんぼん']),
+        ('はち', 'かい', ['はっかい', 'はちかい']),
+        ('にじゅう', 'ふん', ['にじゅっぷん']),
+        ('に', 'ほん', None),
+        ('いち', 'まい', None),
+    ]
+)
+def test_counter_sound_changes(reading1, reading2, expected):
+    assert COUNTER_SOUND_CHANGES.splice(reading1, reading2) == expected
+
+def test_rendaku():
+    words = Compound([Word('日本', 'にほん'), Word('人', 'ひと')], combine=RendakuCombine())
+    assert words.writings == ['日本人', 'にほんびと']
+    assert isinstance(words.readings[0], Reading)
+
+@pytest.mark.parametrize(
+    "policy,expected",
+    [
+        (VariantPolicy.FIRST, ['日本日本日本', 'にほんにほんにほん', 'にほんにほんにっぽん']),
+        (VariantPolicy.KANA_FIRST, ['にほんにほんにほん', 'にほんにほんにっぽん', 'にほんにっぽんにほん']),
+    ]
+)
+def test_budget(policy, expected):
+    word = Word('日本', 'にほん', 'にっぽん')
+    words = Compound([word, word], combine=DefaultCombine(limit=3, policy=policy)) + word
+    assert words.truncated
+    assert words.writings == expected
+    assert words.readings == ['にほんにほんにほん', 'にほんにほんにっぽん', 'にほんにっぽんにほん']
+    assert words.kanji_writings == ['日本日本日本']
+    assert words.lattice.count() == 9
+    assert words.accepts('にっぽんにっぽんにっぽん')
+
+def test_budget_not_reached():
+    word = Word('日本', 'にほん', 'にっぽん')
+    words = Compound([word, word], combine=DefaultCombine(limit=5))
+    assert words.writings == ['日本日本', 'にほんにほん', 'にほんにっぽん', 'にっぽんにほん', 'にっぽんにっぽん']
+    assert not words.truncated
+    assert not (words + Word('猫', 'ねこ')).truncated
+
+def test_best_readings():
+    japan = Word('日本', 'にほん', 'にっぽん')
+    assert japan.best_readings() == ['にほん']
+    assert Word('日本', 'にほん', 'にっぽん', weights={'にっぽん': 1}).best_readings(2) == ['にっぽん', 'にほん']
+    words = japan + Word('人', 'じん') + (Number(7) + PersonCounter())
+    assert words.best_readings() == ['にほんじんななにん']
+    assert words.best_readings(3) == ['にほんじんななにん', 'にほんじんしちにん', 'にっぽんじんななにん']
+    assert words.best_readings(10) == words.readings
+
+def test_best_readings_weights():
+    words = (
+        Word('日本', 'にほん', 'にっぽん', weights={'にっぽん': 2}) +
+        Word('猫', 'ねこ', 'ネコ', weights={'ねこ': 1})
+    )
+    assert words.best_readings(4) == ['にっぽんねこ', 'にっぽんネコ', 'にほんねこ', 'にほんネコ']
+
+def test_best_readings_long():
+    word = Word('日本', 'にほん', 'にっぽん')
+    words = word
+    for _ in range(5000):
+        words = words + word
+    assert words.best_readings() == ['にほん' * 5001]
+
+def test_best_readings_nested():
+    # nested compounds only work out the readings they are asked for
+    japan = Word('日本', 'にほん', 'にっぽん', 'ひのもと')
+    words = Word('猫', 'ねこ') + Compound([japan] * 11)
+    assert words.best_readings(2) == ['ねこ' + 'にほん' * 11, 'ねこ' + 'にほん' * 10 + 'にっぽん']
@@ -58,3 +58,15 @@ def test_number_equal():
     num2 = Number('四十二')
 
     assert num1 == num2
+
+@pytest.mark.parametrize(
+    "digits",
+    [0, 1, 10, 111, 3333, 8888, 10001, 3010000, 6 * 10**16, 8 * 10**16, 18 * 10**16, 10**20 - 1]
+)
+def test_number_compound(digits):
+    n = Number(digits)
+    assert n.writings[1:] == n.compound.writings
+
+def test_number_negative():
+    with pytest.raises(ValueError):
+        Number(-1)
@@ -1,5 +1,5 @@
 import pytest
-from mikan import Reading, Writing
+from mikan import Reading, Writing, disable_interning, enable_interning
 
 @pytest.mark.parametrize(
     "string,expected",
@@ -15,3 +15,57 @@ def test_is_reading(string, expected):
     else:
         assert isinstance(writing, Writing)
         assert not isinstance(writing, Reading)
+
+@pytest.mark.parametrize(
+    "string,expected",
+    [
+        ('', True),
+        ('たべる', True),
+        ('タベル', True),
+        ('食べる', False),
+        ('taberu', False),
+    ]
+)
+def test_accepts(string, expected):
+    assert Reading.accepts(string) == expected
+    assert isinstance(Writing.create(string), Reading) == expected
+
+@pytest.mark.parametrize(
+    "left,right,expected",
+    [
+        (Writing.create('たべ'), 'る', Reading),
+        (Writing.create('たべ'), Writing.create('る'), Reading),
+        (Writing.create('たべ'), '食', Writing),
+        (Writing.create('食べ'), 'る', Writing),
+        (Writing('たべ'), 'る', Reading),
+    ]
+)
+def test_concatenation(left, right, expected):
+    writing = left + right
+    assert type(writing) is expected
+    assert writing == str(left) + str(right)
+
+def test_interning():
+    enable_interning()
+    try:
+        word1 = Writing.create('たべ') + 'る'
+        word2 = Writing.create('たべる')
+        assert word1 is word2
+        assert isinstance(word1, Reading)
+        assert Writing.create('食べる') is Writing.create('食べる')
+    finally:
+        disable_interning()
+    assert Writing.create('食べる') is not Writing.create('食べる')
+
+def test_interning_maxsize():
+    enable_interning(maxsize=1)
+    try:
+        cat = Writing.create('ねこ')
+        assert Writing.create('ねこ') is cat
+        assert Writing.create('いぬ') is not Writing.create('いぬ')
+    finally:
+        disable_interning()
+
+def test_no_dict():
+    assert not hasattr(Writing.create('食べる'), '__dict__')
+    assert not hasattr(Writing.create('たべる'), '__dict__')
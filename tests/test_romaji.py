@@ -1,4 +1,6 @@
+import io
 import pytest
+from mikan.exceptions import ConversionError
 from mikan.utils import *
 
 @pytest.mark.parametrize(
@@ -50,3 +52,160 @@ def test_to_hiragana(romaji, expected):
 )
 def test_to_romaji(kana, expected):
     assert to_romaji(kana) == expected
+
+@pytest.mark.parametrize(
+    "string,expected",
+    [
+        ("猫がいる", "猫gairu"),
+        ("ひゃ!", "hya!"),
+        ("っ", "っ"),
+    ]
+)
+def test_to_romaji_ignore(string, expected):
+    assert to_romaji(string, errors="ignore") == expected
+
+def test_to_romaji_fail():
+    with pytest.raises(ConversionError):
+        to_romaji("ねこ猫")
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_to_romaji_batch(workers):
+    kana = ["ねこ", "カフェ", "ねこ", "ちょっと"] * 3000
+    expected = [to_romaji(string) for string in kana]
+    assert list(to_romaji_batch(kana, workers=workers)) == expected
+
+def test_to_hiragana_batch_fail():
+    with pytest.raises(ConversionError):
+        list(to_hiragana_batch(["neko", "ねこ猫"]))
+
+@pytest.mark.parametrize(
+    "chunks,expected",
+    [
+        (["ky", "a"], "きゃ"),
+        (["k", "y", "a", "kk", "a"], "きゃっか"),
+        (["kin", "'yo", "ubi"], "きんようび"),
+        (["n", "eko"], "ねこ"),
+        (["n"], "ん"),
+    ]
+)
+def test_to_hiragana_stream(chunks, expected):
+    assert "".join(to_hiragana_stream(chunks)) == expected
+
+def test_to_romaji_stream_file():
+    text = "ちょっとまって。" * 10000
+    stream = io.StringIO(text)
+    assert "".join(to_romaji_stream(stream, errors="ignore")) == to_romaji(text, errors="ignore")
+
+@pytest.mark.parametrize(
+    "func,string,errors",
+    [
+        (to_romaji_aligned, "きんようび", None),
+        (to_romaji_aligned, "ちょっと猫だ", "ignore"),
+        (to_hiragana_aligned, "kyakka", None),
+        (to_katakana_aligned, "kin'youbi", None),
+        (to_katakana_aligned, "ねこ", None),
+    ]
+)
+def test_aligned(func, string, errors):
+    converted, sources, targets = func(string, errors)
+    assert len(sources) == len(targets)
+    assert sources[0] == targets[0] == 0
+    assert sources[-1] == len(string)
+    assert targets[-1] == len(converted)
+    spans = zip(zip(sources, sources[1:]), zip(targets, targets[1:]))
+    for (start, end), (ostart, oend) in spans:
+        assert to_romaji(string[start:end], errors="ignore") == to_romaji(converted[ostart:oend], errors="ignore")
+
+@pytest.mark.parametrize(
+    "func,aligned,string",
+    [
+        (to_katakana, to_katakana_aligned, "かゐ"),
+        (to_katakana, to_katakana_aligned, "ゃ"),
+        (to_hiragana, to_hiragana_aligned, "っ"),
+    ]
+)
+def test_aligned_ignore_kana(func, aligned, string):
+    # kana the symbol table doesn't know are kept as is
+    converted, sources, targets = aligned(string, "ignore")
+    assert converted == func(string, "ignore")
+    assert sources[-1] == len(string)
+    assert targets[-1] == len(converted)
+    with pytest.raises(ConversionError):
+        aligned(string)
+
+def test_aligned_spans():
+    converted, sources, targets = to_romaji_aligned("きゃっか")
+    assert converted == "kyakka"
+    assert list(sources) == [0, 2, 4]
+    assert list(targets) == [0, 3, 6]
+
+@pytest.mark.parametrize(
+    "kana,scheme,expected",
+    [
+        ("しゃしん", "kunrei", "syasin"),
+        ("ちょっと", "kunrei", "tyotto"),
+        ("つづける", "kunrei", "tuzukeru"),
+        ("ふじさん", "kunrei", "huzisan"),
+        ("はなをみる", "kunrei", "hanaomiru"),
+        ("つづける", "nihon", "tudukeru"),
+        ("はなをみる", "nihon", "hanawomiru"),
+        ("ちぢむ", "nihon", "tidimu"),
+        ("しゃしん", "ime", "shashin"),
+        ("しゃしん", None, "shashin"),
+    ]
+)
+def test_to_romaji_scheme(kana, scheme, expected):
+    assert to_romaji(kana, scheme=scheme) == expected
+
+@pytest.mark.parametrize(
+    "romaji,scheme,expected",
+    [
+        ("syasin", "kunrei", "しゃしん"),
+        ("tudukeru", "nihon", "つづける"),
+        ("sixtutu", "ime", "しっつ"),
+        ("konnnichiha", "ime", "こんにちは"),
+        ("tyottomatte", "ime", "ちょっとまって"),
+        ("lyaxyu", "ime", "ゃゅ"),
+        ("twu", "ime", "とぅ"),
+    ]
+)
+def test_to_hiragana_scheme(romaji, scheme, expected):
+    assert to_hiragana(romaji, scheme=scheme) == expected
+
+def test_unknown_scheme():
+    with pytest.raises(ValueError):
+        to_romaji("ねこ", scheme="unknown")
+
+def test_register_scheme():
+    register_scheme("cat", Scheme([["nya", "にゃ", "ニャ"]]))
+    assert to_romaji("にゃにゃ", scheme="cat") == "nyanya"
+    assert to_katakana("nyanya", scheme="cat") == "ニャニャ"
+
+def test_incremental_converter():
+    converter = IncrementalConverter(scheme="ime")
+    converter.append("k")
+    assert converter.kana == ""
+    assert converter.pending == "k"
+    converter.append("y")
+    assert converter.pending == "ky"
+    converter.append("a")
+    assert converter.kana == "きゃ"
+    assert converter.pending == ""
+    converter.append("n")
+    assert str(converter) == "きゃn"
+    converter.append("k")
+    assert converter.kana == "きゃん"
+    converter.delete()
+    assert converter.kana == "きゃ"
+    assert converter.pending == "n"
+    converter.delete(2)
+    assert converter.kana == ""
+    assert converter.pending == "ky"
+    converter.append("ottu")
+    assert converter.flush() == "きょっつ"
+
+def test_incremental_converter_katakana():
+    converter = IncrementalConverter(katakana=True)
+    for char in "kohi-":
+        converter.append(char)
+    assert converter.kana == "コヒー"
@@ -1,5 +1,13 @@
+import threading
 import pytest
-from mikan.utils import is_hiragana, is_katakana, to_hiragana, to_katakana
+from mikan import utils
+from mikan.utils import (
+    hiragana_to_katakana, is_hiragana, is_hiragana_batch, is_kana, is_kana_batch, is_katakana,
+    is_katakana_batch, katakana_to_hiragana, segment, Script, to_hiragana, to_hiragana_batch,
+    to_hiragana_aligned, to_hiragana_stream, to_katakana, to_katakana_aligned, to_katakana_batch,
+    to_katakana_stream, to_romaji, to_romaji_aligned, to_romaji_stream
+)
+from mikan.exceptions import ConversionError
 
 @pytest.mark.parametrize(
     "string,expected",
@@ -38,3 +46,122 @@ def test_is_katakana(string, expected):
 def test_conversion(hiragana, katakana):
     assert to_hiragana(katakana) == hiragana
     assert to_katakana(hiragana) == katakana
+
+def test_shared_converter():
+    converters = []
+    threads = [
+        threading.Thread(target=lambda: converters.append(utils._get_converter()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(converter is converters[0] for converter in converters)
+
+@pytest.mark.parametrize(
+    "hiragana,katakana",
+    [
+        ("ねこ", "ネコ"),
+        ("ゔぁいおりん", "ヴァイオリン"),
+        ("っ", "ッ"),
+        ("ぁぃぅぇぉゃゅょゎゕゖ", "ァィゥェォャュョヮヵヶ"),
+        ("あゝ、ゞ", "アヽ、ヾ"),
+        ("猫ねこneko", "猫ネコneko"),
+    ]
+)
+def test_kana_translation(hiragana, katakana):
+    assert hiragana_to_katakana(hiragana) == katakana
+    assert katakana_to_hiragana(katakana) == hiragana
+
+def test_kana_translation_passthrough():
+    assert katakana_to_hiragana("コーヒー・ヷ") == "こーひー・ヷ"
+    assert hiragana_to_katakana("ゟ") == "ゟ"
+
+def _outcome(func, string):
+    try:
+        return func(string)
+    except ConversionError:
+        return ConversionError
+
+@pytest.mark.parametrize(
+    "string",
+    ['ヷ', 'ヵ', 'ッ', 'ゝ', '゛', 'ねこヷ', 'ヴァイオリン', 'コーヒー・ねこ']
+)
+def test_conversion_paths_agree(string):
+    for func, batch, stream in (
+        (to_hiragana, to_hiragana_batch, to_hiragana_stream),
+        (to_katakana, to_katakana_batch, to_katakana_stream),
+    ):
+        expected = _outcome(func, string)
+        assert _outcome(lambda x: list(batch([x]))[0], string) == expected # pylint: disable=cell-var-from-loop
+        assert _outcome(lambda x: ''.join(stream([x])), string) == expected # pylint: disable=cell-var-from-loop
+    assert _outcome(to_hiragana, 'ヷ') is ConversionError
+
+@pytest.mark.parametrize(
+    "func,batch",
+    [
+        (is_kana, is_kana_batch),
+        (is_hiragana, is_hiragana_batch),
+        (is_katakana, is_katakana_batch),
+    ]
+)
+def test_batch_classification(func, batch):
+    strings = ['', 'ねこ', 'ネコ', 'ねコ', '猫', 'ねこ\x00', chr(0x3040), chr(0x30FF), 'ジャン゠ポール']
+    assert batch(strings) == [func(string) for string in strings]
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_batch_classification_paths(monkeypatch, numpy):
+    if numpy:
+        monkeypatch.setattr(utils, 'np', pytest.importorskip('numpy'))
+        monkeypatch.setattr(utils, '_BATCH_CELLS', 16)
+    else:
+        monkeypatch.setattr(utils, 'np', None)
+    strings = ['ね'] * 20 + ['ね' * 20, 'ね' * 19 + 'コ', '', 'ねこ\x00', 'ネ' * 8, 'ねコ']
+    assert is_hiragana_batch(strings) == [is_hiragana(string) for string in strings]
+    assert is_kana_batch(strings) == [is_kana(string) for string in strings]
+
+def test_segment():
+    assert segment("猫が3匹、ネコとkin'youbi!") == [
+        (Script.KANJI, "猫"),
+        (Script.HIRAGANA, "が"),
+        (Script.DIGIT, "3"),
+        (Script.KANJI, "匹"),
+        (Script.OTHER, "、"),
+        (Script.KATAKANA, "ネコ"),
+        (Script.HIRAGANA, "と"),
+        (Script.LATIN, "kin'youbi"),
+        (Script.OTHER, "!"),
+    ]
+
+@pytest.mark.parametrize(
+    "string,expected",
+    [
+        ("", ""),
+        ("猫が3匹。", "猫ga3匹。"),
+        ("コーヒーを飲む", "ko-hi-wo飲mu"),
+    ]
+)
+def test_to_romaji_passthrough(string, expected):
+    assert to_romaji(string, errors="passthrough") == expected
+
+def test_to_hiragana_passthrough():
+    assert to_hiragana("猫がkin'youbiにデパートへ。", errors="passthrough") == "猫がきんようびにでぱーとへ。"
+
+@pytest.mark.parametrize(
+    "string",
+    ["東京 - ka", "猫がkin'youbiにデパートへ。", "ka-ku-ke-ko 東京", "コーヒーを飲む"]
+)
+@pytest.mark.parametrize("size", [1, 2, 3, 100])
+def test_passthrough_paths_agree(string, size):
+    chunks = [string[start:start + size] for start in range(0, len(string), size)]
+    for func, stream, aligned in (
+        (to_romaji, to_romaji_stream, to_romaji_aligned),
+        (to_hiragana, to_hiragana_stream, to_hiragana_aligned),
+        (to_katakana, to_katakana_stream, to_katakana_aligned),
+    ):
+        expected = func(string, errors="passthrough")
+        assert ''.join(stream(chunks, errors="passthrough")) == expected
+        converted, sources, targets = aligned(string, errors="passthrough")
+        assert converted == expected
+        assert sources[-1] == len(string) and targets[-1] == len(converted)
@@ -79,3 +79,19 @@ def test_word_add_str():
     word1 = Word('リンゴ')
     word2 = word1 + 'が'
     assert 'リンゴが' in word2.readings
+
+def test_word_hash():
+    word1 = Word('日本', 'にほん')
+    word2 = Word('にほん', '日本')
+    assert hash(word1) == hash(word2)
+    assert len({word1, word2, Word('日本')}) == 2
+
+def test_compound_hash():
+    words = [Word('日本', 'にほん') + Word('料理', 'りょうり') for _ in range(3)]
+    assert len(set(words)) == 1
+    assert {words[0]: 1}[Word('日本料理', 'にほんりょうり')] == 1
+
+def test_word_writings_copy():
+    word = Word('日本', 'にほん')
+    word.writings.append('にっぽん')
+    assert word.writings == ['日本', 'にほん']